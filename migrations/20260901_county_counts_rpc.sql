@@ -0,0 +1,30 @@
+-- ============================================================================
+-- ZoneWise County Counts RPC
+-- Migration: 20260901_county_counts_rpc.sql
+--
+-- PURPOSE: Answer "how many districts / standards does this county have"
+-- with one aggregate query instead of a REST fan-out.
+--
+-- The county stats agent previously fetched every district id for the
+-- county's jurisdictions and then issued chunked header-only counts against
+-- zone_standards. This RPC joins the three tables once in Postgres and
+-- returns the two totals as a single row.
+--
+-- CALLED BY: server/main.py agent_county_stats (county branch) via
+--   POST /rest/v1/rpc/counts_by_county
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION counts_by_county(p_county text)
+RETURNS TABLE (districts bigint, standards bigint)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        COUNT(DISTINCT zd.id) AS districts,
+        COUNT(zs.id)          AS standards
+    FROM jurisdictions j
+    JOIN zoning_districts zd ON zd.jurisdiction_id = j.id
+    LEFT JOIN zone_standards zs ON zs.zoning_district_id = zd.id
+    WHERE j.county ILIKE p_county;
+$$;
+
+GRANT EXECUTE ON FUNCTION counts_by_county(text) TO anon, authenticated;
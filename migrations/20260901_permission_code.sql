@@ -0,0 +1,57 @@
+-- ============================================================================
+-- ZoneWise Permission Code Denormalization
+-- Migration: 20260901_permission_code.sql
+--
+-- PURPOSE: Normalize permitted_uses.permission_type string variants once at
+-- the database, not per request in the API server.
+--
+-- County scrapers write a mix of spellings ("P", "permitted", "by-right",
+-- "CU", "not-permitted", ...). The address agent re-mapped those variants on
+-- every row of every query. This migration adds a canonical single-character
+-- permission_code ('P' / 'C' / 'N'), backfills it from the variants, keeps it
+-- populated via trigger for future inserts, and adds partial indexes so
+-- filtered lookups (e.g. "all by-right uses in district X") stay index-only.
+--
+-- READ BY: server/main.py agent_address_query (falls back to mapping
+-- permission_type in Python until this migration is applied)
+-- ============================================================================
+
+ALTER TABLE permitted_uses
+    ADD COLUMN IF NOT EXISTS permission_code CHAR(1);
+
+UPDATE permitted_uses SET permission_code = CASE
+    WHEN permission_type IN ('P', 'permitted', 'by-right')       THEN 'P'
+    WHEN permission_type IN ('C', 'conditional', 'CU')           THEN 'C'
+    WHEN permission_type IN ('N', 'prohibited', 'not-permitted') THEN 'N'
+    ELSE NULL
+END
+WHERE permission_code IS NULL;
+
+ALTER TABLE permitted_uses
+    ADD CONSTRAINT permitted_uses_permission_code_check
+    CHECK (permission_code IN ('P', 'C', 'N'));
+
+-- Keep the column current as scrapers insert new rows
+CREATE OR REPLACE FUNCTION set_permission_code()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.permission_code := CASE
+        WHEN NEW.permission_type IN ('P', 'permitted', 'by-right')       THEN 'P'
+        WHEN NEW.permission_type IN ('C', 'conditional', 'CU')           THEN 'C'
+        WHEN NEW.permission_type IN ('N', 'prohibited', 'not-permitted') THEN 'N'
+        ELSE NULL
+    END;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS permitted_uses_permission_code ON permitted_uses;
+CREATE TRIGGER permitted_uses_permission_code
+    BEFORE INSERT OR UPDATE OF permission_type ON permitted_uses
+    FOR EACH ROW EXECUTE FUNCTION set_permission_code();
+
+-- Partial indexes for future filtered queries per bucket
+CREATE INDEX IF NOT EXISTS idx_permitted_uses_district_p
+    ON permitted_uses (zoning_district_id) WHERE permission_code = 'P';
+CREATE INDEX IF NOT EXISTS idx_permitted_uses_district_c
+    ON permitted_uses (zoning_district_id) WHERE permission_code = 'C';
@@ -0,0 +1,32 @@
+-- ============================================================================
+-- ZoneWise Stats Snapshot RPC
+-- Migration: 20260901_stats_snapshot_rpc.sql
+--
+-- PURPOSE: Serve the /api/stats counts with one round trip.
+--
+-- The stats endpoint issued five concurrent header-only COUNT(*) requests
+-- (jurisdictions, zoning_districts, zone_standards, parcel_zones,
+-- overlay_districts). The gather hides the network latency but each count is
+-- still a separate scan with its own PostgREST request. This function runs
+-- all five inside one statement and returns them as a json object; if the
+-- tables outgrow exact counts, swap the subselects for pg_class.reltuples
+-- estimates without touching the API.
+--
+-- CALLED BY: server/main.py _stats_payload via
+--   POST /rest/v1/rpc/stats_snapshot
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION stats_snapshot()
+RETURNS json
+LANGUAGE sql STABLE
+AS $$
+    SELECT json_build_object(
+        'jurisdictions',     (SELECT count(*) FROM jurisdictions),
+        'zoning_districts',  (SELECT count(*) FROM zoning_districts),
+        'zone_standards',    (SELECT count(*) FROM zone_standards),
+        'parcel_zones',      (SELECT count(*) FROM parcel_zones),
+        'overlay_districts', (SELECT count(*) FROM overlay_districts)
+    );
+$$;
+
+GRANT EXECUTE ON FUNCTION stats_snapshot() TO anon, authenticated;
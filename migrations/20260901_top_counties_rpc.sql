@@ -0,0 +1,29 @@
+-- ============================================================================
+-- ZoneWise Top-Counties RPC
+-- Migration: 20260901_top_counties_rpc.sql
+--
+-- PURPOSE: Move the statewide "top counties by 90%+ jurisdictions"
+-- aggregation out of the API server and into Postgres.
+--
+-- The statewide stats agent previously fetched up to 200 jurisdiction rows
+-- over REST and counted them per county with a Python Counter. This RPC
+-- returns the already-grouped top-10 list, so the server transfers ~10 rows
+-- instead of 200 and does no aggregation of its own.
+--
+-- CALLED BY: server/main.py agent_county_stats (statewide branch) via
+--   POST /rest/v1/rpc/top_counties_90
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION top_counties_90()
+RETURNS TABLE (county text, jurisdictions bigint)
+LANGUAGE sql STABLE
+AS $$
+    SELECT county, COUNT(*) AS jurisdictions
+    FROM jurisdictions
+    WHERE data_completeness >= 90
+    GROUP BY county
+    ORDER BY jurisdictions DESC, county
+    LIMIT 10;
+$$;
+
+GRANT EXECUTE ON FUNCTION top_counties_90() TO anon, authenticated;
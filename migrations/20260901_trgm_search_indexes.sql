@@ -0,0 +1,30 @@
+-- ============================================================================
+-- ZoneWise Trigram Search Indexes
+-- Migration: 20260901_trgm_search_indexes.sql
+--
+-- PURPOSE: Index the substring searches behind /api/search and the chat
+-- context path.
+--
+-- Those endpoints filter zoning_districts with
+-- `or=(code.ilike.%q%, name.ilike.%q%)`. A leading-wildcard ILIKE cannot use
+-- a btree index, so every search was a sequential scan that slows linearly
+-- as counties are ingested. pg_trgm GIN indexes let the planner answer both
+-- ILIKE patterns from the index. No application change needed — PostgREST
+-- plans against the new indexes automatically.
+--
+-- USED BY: server/main.py search_districts and _build_chat_context
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_zoning_districts_code_trgm
+    ON zoning_districts USING gin (code gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_zoning_districts_name_trgm
+    ON zoning_districts USING gin (name gin_trgm_ops);
+
+-- Jurisdiction resolution (address agent fallback, /api/jurisdictions
+-- county filter) uses the same leading-wildcard ILIKE shape.
+CREATE INDEX IF NOT EXISTS idx_jurisdictions_name_trgm
+    ON jurisdictions USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_jurisdictions_county_trgm
+    ON jurisdictions USING gin (county gin_trgm_ops);
@@ -0,0 +1,71 @@
+-- ============================================================================
+-- ZoneWise Address-Query District RPC
+-- Migration: 20260902_districts_for_address_rpc.sql
+-- DEPENDS ON: 20260901_permission_code.sql (the function body selects
+-- pu.permission_code, so that column must exist when this is applied;
+-- the date bump keeps filename order equal to dependency order)
+--
+-- PURPOSE: Return only the districts the address answer actually renders.
+--
+-- The address agent displays at most 6 districts per category, residential
+-- categories first, yet fetched up to 200 districts (plus their standards and
+-- uses) and discarded most of them in Python. This function ranks districts
+-- per category in Postgres, keeps the top 6 of each, orders residential
+-- categories first, and embeds standards and permitted uses for just the
+-- surviving rows — ~5x less egress for large jurisdictions.
+--
+-- Returns jsonb: {"total": <district count>, "districts": [...]}, where total
+-- is the uncapped count so the answer header stays accurate.
+--
+-- CALLED BY: server/main.py agent_address_query via
+--   POST /rest/v1/rpc/districts_for_address
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION districts_for_address(p_jid bigint)
+RETURNS jsonb
+LANGUAGE sql STABLE
+AS $$
+WITH ranked AS (
+    SELECT zd.id, zd.code, zd.name, zd.category, zd.description,
+           row_number() OVER (PARTITION BY zd.category ORDER BY zd.code) AS rn
+    FROM zoning_districts zd
+    WHERE zd.jurisdiction_id = p_jid
+),
+capped AS (
+    SELECT * FROM ranked WHERE rn <= 6
+)
+SELECT jsonb_build_object(
+    'total', (SELECT count(*) FROM zoning_districts
+              WHERE jurisdiction_id = p_jid),
+    'districts', COALESCE(jsonb_agg(
+        jsonb_build_object(
+            'id', c.id,
+            'code', c.code,
+            'name', c.name,
+            'category', c.category,
+            'description', c.description,
+            'zone_standards',
+                (SELECT jsonb_agg(to_jsonb(zs))
+                 FROM zone_standards zs
+                 WHERE zs.zoning_district_id = c.id),
+            'permitted_uses',
+                (SELECT jsonb_agg(jsonb_build_object(
+                            'zoning_district_id', pu.zoning_district_id,
+                            'use_type', pu.use_type,
+                            'use_name', pu.use_name,
+                            'permission_type', pu.permission_type,
+                            'permission_code', pu.permission_code)
+                        ORDER BY pu.permission_type, pu.use_name)
+                 FROM permitted_uses pu
+                 WHERE pu.zoning_district_id = c.id)
+        )
+        ORDER BY
+            CASE WHEN c.category IN ('Residential', 'Single Family',
+                                     'Multi-Family') THEN 0 ELSE 1 END,
+            c.category, c.code
+    ), '[]'::jsonb)
+)
+FROM capped c;
+$$;
+
+GRANT EXECUTE ON FUNCTION districts_for_address(bigint) TO anon, authenticated;
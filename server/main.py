@@ -5,18 +5,28 @@ Queries REAL data from Supabase across all 67 FL counties
 Hybrid: regex intent classification + Claude Sonnet 4.5 for complex queries
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, HTMLResponse, FileResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse, HTMLResponse, FileResponse, ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
+from enum import IntEnum
+from functools import lru_cache
+from collections import Counter, OrderedDict, defaultdict
+import copy
+import hashlib
+import io
 import os
+import time
 import json
+import orjson
 import httpx
 import re
 import asyncio
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
+import base64
 import anthropic
 
 
@@ -24,10 +34,29 @@ import anthropic
 # APP CONFIG
 # ═══════════════════════════════════════════════════════════════
 
+from contextlib import asynccontextmanager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the pooled client eagerly so the first request after a deploy
+    # pays no client-construction cost, and close it cleanly on shutdown.
+    await get_client()
+    await prime_jurisdiction_cache()
+    refresh = asyncio.create_task(_refresh_jurisdiction_cache())
+    yield
+    refresh.cancel()
+    global _http_client
+    if _http_client and not _http_client.is_closed:
+        await _http_client.aclose()
+
+
 app = FastAPI(
     title="ZoneWise Agent API",
     description="Enterprise zoning intelligence for all 67 FL counties",
     version="1.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -49,30 +78,54 @@ SUPABASE_URL = os.getenv("SUPABASE_URL", "https://mocerqjnksmhcjzxrewo.supabase.
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 
-# Persistent HTTP client for connection pooling
+# Built once; every Supabase call reuses the same header dicts.
+_SB_HEADERS = {
+    "apikey": SUPABASE_KEY,
+    "Authorization": f"Bearer {SUPABASE_KEY}",
+}
+_SB_COUNT_HEADERS = {**_SB_HEADERS, "Prefer": "count=exact", "Range": "0-0"}
+
+# Persistent HTTP client for connection pooling. Creation is lock-guarded so
+# a cold-start burst builds one client (one TLS handshake), not one per
+# request, and the client is re-bound if the event loop changes on reload.
 _http_client: httpx.AsyncClient = None
+_http_client_loop = None
+_client_lock = asyncio.Lock()
 
 
 async def get_client() -> httpx.AsyncClient:
-    global _http_client
-    if _http_client is None or _http_client.is_closed:
-        _http_client = httpx.AsyncClient(timeout=15.0)
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        async with _client_lock:
+            if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+                # http2: Supabase's edge negotiates h2, so the gather fan-outs
+                # (stats counts, agent queries, workflow runs) multiplex onto
+                # one warm connection instead of paying per-socket TLS setup.
+                _http_client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(15.0, connect=3.0),
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=50,
+                                        max_connections=100,
+                                        keepalive_expiry=30.0),
+                )
+                _http_client_loop = loop
     return _http_client
 
 
-@app.on_event("shutdown")
-async def shutdown():
-    global _http_client
-    if _http_client and not _http_client.is_closed:
-        await _http_client.aclose()
+_PARAM_STRIP_RE = re.compile(r"[%&=\\/'\";\n\r\t]")
+
 
 def sanitize_param(value: str) -> str:
     """Sanitize user input for Supabase REST query parameters.
-    Removes characters that could break or inject query strings."""
+    Strips query-string control characters, then percent-encodes what
+    remains so the value can only ever be a literal filter operand."""
     if not value:
         return ""
-    # Remove query string control characters
-    return re.sub(r'[%&=\\/'";\n\r\t]', '', value).strip()[:200]
+    cleaned = _PARAM_STRIP_RE.sub("", value).strip()[:200]
+    # Commas are PostgREST or=(...) grammar, so they must be encoded; the
+    # in.() callers sanitize individual codes before joining with commas.
+    return quote(cleaned, safe=" .")
 
 
 
@@ -109,64 +162,157 @@ Current platform data: {stats}
 # SUPABASE DATA LAYER
 # ═══════════════════════════════════════════════════════════════
 
-async def sb_query(table: str, params: str = "", limit: int = 100) -> List[Dict]:
-    """Query Supabase REST API. params is the raw query string."""
+# In-process TTL cache for read-mostly results (jurisdiction lookups, counts).
+# Keys are (table, params, limit); values expire on a monotonic deadline and
+# the least-recently-used entry is evicted once the cache is full.
+_SB_CACHE: OrderedDict = OrderedDict()
+_SB_CACHE_MAX = 2048
+
+
+def _cache_get(key):
+    entry = _SB_CACHE.get(key)
+    if entry is None:
+        return None
+    expires, value = entry
+    if time.monotonic() >= expires:
+        del _SB_CACHE[key]
+        return None
+    _SB_CACHE.move_to_end(key)
+    # Hand out a copy: agents unpack results destructively (popping embedded
+    # zone_standards / permitted_uses), so a shared reference would poison
+    # every warm hit after the first.
+    return copy.deepcopy(value)
+
+
+def _cache_put(key, value, ttl: float):
+    if len(_SB_CACHE) >= _SB_CACHE_MAX:
+        _SB_CACHE.popitem(last=False)
+    # Copy on the way in too — callers mutate the object they were returned
+    # after it has been stored.
+    _SB_CACHE[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+
+
+async def sb_query(table: str, params: str = "", limit: int = 100,
+                   ttl: float = 0) -> List[Dict]:
+    """Query Supabase REST API. params is the raw query string.
+    Pass ttl (seconds) to serve repeat reads from the in-process cache."""
     if not SUPABASE_KEY:
         raise HTTPException(status_code=503, detail="Database not configured")
+    key = (table, params, limit)
+    if ttl:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
     client = await get_client()
     sep = "&" if params else ""
     url = f"{SUPABASE_URL}/rest/v1/{table}?{params}{sep}limit={limit}"
-    resp = await client.get(url, headers={
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-    })
+    resp = await client.get(url, headers=_SB_HEADERS)
     if resp.status_code != 200:
         return []
-    return resp.json()
+    data = orjson.loads(resp.content)
+    if ttl:
+        _cache_put(key, data, ttl)
+    return data
 
 
-async def sb_count(table: str, params: str = "") -> int:
-    """Get count from Supabase table."""
+async def sb_count(table: str, params: str = "", ttl: float = 0,
+                   select: str = "id") -> int:
+    """Get count from Supabase table. ttl enables the in-process cache.
+    select picks the counted column; use the filtered column so Postgres
+    can satisfy the count from that column's index."""
     if not SUPABASE_KEY:
         return 0
+    key = ("#count", table, params, select)
+    if ttl:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
     client = await get_client()
-    url = f"{SUPABASE_URL}/rest/v1/{table}?{params}&select=id"
-    resp = await client.get(url, headers={
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Prefer": "count=exact",
-        "Range": "0-0",
-    })
+    url = f"{SUPABASE_URL}/rest/v1/{table}?{params}&select={select}"
+    resp = await client.get(url, headers=_SB_COUNT_HEADERS)
     cr = resp.headers.get("content-range", "*/0")
     try:
-        return int(cr.split("/")[1])
+        count = int(cr.split("/")[1])
     except (IndexError, ValueError):
         return 0
+    if ttl:
+        _cache_put(key, count, ttl)
+    return count
+
+
+async def sb_rpc(fn: str, args: Optional[Dict] = None, ttl: float = 0) -> Any:
+    """Call a Postgres function via the Supabase RPC endpoint.
+    Raises on non-200 so callers can fall back to REST queries."""
+    if not SUPABASE_KEY:
+        raise HTTPException(status_code=503, detail="Database not configured")
+    key = ("#rpc", fn, orjson.dumps(args or {}, option=orjson.OPT_SORT_KEYS))
+    if ttl:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+    client = await get_client()
+    resp = await client.post(f"{SUPABASE_URL}/rest/v1/rpc/{fn}",
+                             headers=_SB_HEADERS, json=args or {})
+    resp.raise_for_status()
+    data = orjson.loads(resp.content) if resp.content else None
+    if ttl:
+        _cache_put(key, data, ttl)
+    return data
+
+
+
+_DIMS_OPEN = "<!--DIMS:"
+_DIMS_CLOSE = "-->"
 
 
 def extract_dims(description: str) -> Dict[str, Any]:
     """Extract DIMS JSON from description HTML comment."""
     if not description:
         return {}
-    m = re.search(r'<!--DIMS:({.*?})-->', description)
-    if m:
-        try:
-            return json.loads(m.group(1))
-        except json.JSONDecodeError:
-            pass
-    return {}
+    # Plain find/slice instead of a regex: most rows have no marker, and
+    # the payload is a well-delimited JSON object when they do.
+    start = description.find(_DIMS_OPEN)
+    if start == -1:
+        return {}
+    start += len(_DIMS_OPEN)
+    end = description.find(_DIMS_CLOSE, start)
+    if end == -1:
+        return {}
+    try:
+        dims = orjson.loads(description[start:end])
+    except orjson.JSONDecodeError:
+        return {}
+    return dims if isinstance(dims, dict) else {}
 
 
 # ═══════════════════════════════════════════════════════════════
 # MODELS
 # ═══════════════════════════════════════════════════════════════
 
+# ═══════════════════════════════════════════════════════════════
+# SSE FRAMING — encoded once, reused on every chunk of every stream
+# ═══════════════════════════════════════════════════════════════
+
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b'data: {"type": "done"}\n\n'
+
+
+def _sse(payload: Dict[str, Any]) -> bytes:
+    """Frame a payload as a pre-encoded SSE data event."""
+    return _SSE_PREFIX + orjson.dumps(payload, default=str) + _SSE_SUFFIX
+
+
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     query: str = Field(..., min_length=1, max_length=2000)
     session_id: Optional[str] = "anonymous"
     history: Optional[List[Dict[str, str]]] = None
 
 class ChatResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     answer: str
     intent: str
     entities: Dict[str, Any]
@@ -179,29 +325,42 @@ class ChatResponse(BaseModel):
 # INTENT CLASSIFICATION + ENTITY EXTRACTION
 # ═══════════════════════════════════════════════════════════════
 
+class Intent(IntEnum):
+    """Intent ids double as indices into the agent dispatch table."""
+    COMPARISON = 0
+    ADDRESS_QUERY = 1
+    FEASIBILITY = 2
+    LIST_DISTRICTS = 3
+    DISTRICT_DETAIL = 4
+    PARCEL_LOOKUP = 5
+    REPORT = 6
+    COUNTY_STATS = 7
+    GENERAL = 8
+
+
 INTENT_RULES = [
     # COMPARISON first — strong signal
-    ("COMPARISON", ["compare", "difference between", "vs ", "versus"]),
+    (Intent.COMPARISON, ["compare", "difference between", "vs ", "versus"]),
     # ADDRESS_QUERY before FEASIBILITY — "what can I build at [address]" must
     # match here, not fall into generic FEASIBILITY which has no address handling
-    ("ADDRESS_QUERY", ["what can i build at", "can i build at", "build at",
-                       "what can be built at", "development at",
-                       "build on", "build a ", "build an ",
-                       "what's allowed at", "whats allowed at",
-                       "zoning at", "zone at", "zoned at"]),
+    (Intent.ADDRESS_QUERY, ["what can i build at", "can i build at", "build at",
+                            "what can be built at", "development at",
+                            "build on", "build a ", "build an ",
+                            "what's allowed at", "whats allowed at",
+                            "zoning at", "zone at", "zoned at"]),
     # FEASIBILITY: zone-code questions without a street address
-    ("FEASIBILITY", ["is it feasible", "is it possible", "feasible",
-                     "allowed in", "permitted in", "permitted use",
-                     "is a ", "is an "]),
-    ("LIST_DISTRICTS", ["what zones", "zoning districts", "list zones", "all zones",
-                        "what zoning", "districts in", "zone types"]),
-    ("DISTRICT_DETAIL", ["setback", "height limit", "lot size", "density",
-                         "far ", "floor area", "building envelope", "requirements for"]),
-    ("PARCEL_LOOKUP", ["parcel", "folio", "property at",
-                       "what zone is", "zoned as"]),
-    ("REPORT", ["report", "generate", "pdf", "export", "download"]),
-    ("COUNTY_STATS", ["how many", "statistics", "coverage", "counties",
-                      "total districts"]),
+    (Intent.FEASIBILITY, ["is it feasible", "is it possible", "feasible",
+                          "allowed in", "permitted in", "permitted use",
+                          "is a ", "is an "]),
+    (Intent.LIST_DISTRICTS, ["what zones", "zoning districts", "list zones", "all zones",
+                             "what zoning", "districts in", "zone types"]),
+    (Intent.DISTRICT_DETAIL, ["setback", "height limit", "lot size", "density",
+                              "far ", "floor area", "building envelope", "requirements for"]),
+    (Intent.PARCEL_LOOKUP, ["parcel", "folio", "property at",
+                            "what zone is", "zoned as"]),
+    (Intent.REPORT, ["report", "generate", "pdf", "export", "download"]),
+    (Intent.COUNTY_STATS, ["how many", "statistics", "coverage", "counties",
+                           "total districts"]),
 ]
 
 
@@ -218,12 +377,41 @@ def format_confidence(score) -> str:
     else:
         return "_\u26a0\ufe0f Unverified data \u2014 confirm with source_"
 
-def classify_intent(query: str) -> str:
-    q = query.lower()
-    for intent, keywords in INTENT_RULES:
-        if any(kw in q for kw in keywords):
-            return intent
-    return "GENERAL"
+# All intent keywords compiled into one alternation (longest first, so the
+# longest keyword wins at any position); each keyword maps back to its rule's
+# priority so the highest-priority rule still decides ties. The alternation
+# sits inside a lookahead so matches are zero-width and overlapping keywords
+# are all seen — a plain alternation consumes text, and e.g. "what zoning at"
+# would match "what zoning" (LIST_DISTRICTS) while swallowing the "zoning at"
+# (ADDRESS_QUERY) that INTENT_RULES promises wins.
+_INTENT_PRIORITY: Dict[str, tuple] = {}
+for _priority, (_intent, _keywords) in enumerate(INTENT_RULES):
+    for _kw in _keywords:
+        _INTENT_PRIORITY.setdefault(_kw, (_priority, _intent))
+del _priority, _intent, _keywords, _kw
+
+_INTENT_RE = re.compile("(?=(" + "|".join(
+    re.escape(kw) for kw in sorted(_INTENT_PRIORITY, key=len, reverse=True))
+    + "))")
+
+
+@lru_cache(maxsize=2048)
+def classify_intent(q_lower: str) -> Intent:
+    """Classify intent from the casefolded query (computed once per request).
+
+    Chat traffic repeats heavily (suggestion chips, retries, demo queries),
+    so a hit skips the keyword scan entirely.
+    """
+    best = None
+    for m in _INTENT_RE.finditer(q_lower):
+        rank = _INTENT_PRIORITY[m.group(1)]
+        if best is None or rank < best:
+            best = rank
+            if rank[0] == 0:
+                break
+    if best is not None:
+        return best[1]
+    return Intent.GENERAL
 
 
 # All 67 FL county names for matching
@@ -269,41 +457,105 @@ FL_CITIES = [
 ]
 
 
-def extract_entities(query: str) -> Dict[str, Any]:
-    entities = {}
-    q = query.lower()
+# Lowercase lookup tables built once at import: canonical-name recovery plus a
+# first-token gate so queries that mention no jurisdiction skip the scans.
+_CITIES_LC = {c.lower(): c for c in FL_CITIES}
+_COUNTIES_LC = {c.lower(): c for c in FL_COUNTIES}
+_JUR_FIRST_TOKENS = frozenset(n.split()[0] for n in _CITIES_LC) | \
+                    frozenset(n.split()[0] for n in _COUNTIES_LC)
+_TOKEN_RE = re.compile(r"[a-z][a-z.\-']*")
+
 
+def _name_alternation(names: List[str]) -> str:
+    """Lowercased names as one alternation, longest first so the longest
+    candidate wins at any given position."""
+    return "|".join(
+        re.escape(n.lower()) for n in sorted(names, key=len, reverse=True))
+
+
+# Cities and counties share one compiled pattern; the named group tells them
+# apart, so one C-level scan replaces the old city-then-county double search.
+_JURISDICTION_RE = re.compile(
+    f"(?P<city>{_name_alternation(FL_CITIES)})"
+    f"|(?P<county>{_name_alternation(FL_COUNTIES)})")
+
+
+# Single-pass entity scanner: parcel ID, street address, and zoning code as a
+# union of named groups so one C-level walk of the query replaces three searches.
+_ENTITY_RE = re.compile(
+    # Parcel ID patterns: XX XXXX-XX-XXX or numeric folio
+    r"\b(?P<parcel_id>\d{2}\s*\d{4}-\d{2}-\d{3})\b"
+    # Address pattern
+    r"|(?P<address>\d+\s+[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*\s+(?:St|Ave|Blvd|Rd|Dr|Ct|Ln|Way|Pl|Cir))"
     # Zoning code: RS-1, BU-1-A, RR-65, C-2, PUD, GU, etc.
-    code_match = re.search(r'\b([A-Z]{1,5}(?:-\d{1,3})?(?:-[A-Z]{1,2})?)\b', query)
-    if code_match:
-        candidate = code_match.group(1)
-        # Filter out common false positives
-        if len(candidate) >= 2 and candidate not in {"FL", "AI", "US", "OR", "IN", "ID"}:
-            entities["zoning_code"] = candidate
-
-    # Jurisdiction: try cities first (more specific), then counties
-    for city in sorted(FL_CITIES, key=len, reverse=True):
-        if city.lower() in q:
-            entities["jurisdiction"] = city
+    r"|\b(?P<zoning_code>[A-Z]{1,5}(?:-\d{1,3})?(?:-[A-Z]{1,2})?)\b"
+)
+
+# Common zoning-code false positives to ignore
+_CODE_STOPWORDS = frozenset({"FL", "AI", "US", "OR", "IN", "ID"})
+
+
+# Entities worth extracting live in the first few hundred characters of any
+# real query; scanning pasted walls of text just burns regex time.
+_ENTITY_SCAN_LIMIT = 512
+
+
+def extract_entities(query: str, q_lower: Optional[str] = None) -> Dict[str, Any]:
+    """Extract entities, memoized on the raw query (hot repeats skip all scans)."""
+    query = query[:_ENTITY_SCAN_LIMIT]
+    if q_lower is None:
+        q_lower = query.casefold()
+    return dict(_extract_entities_cached(query, q_lower[:_ENTITY_SCAN_LIMIT]))
+
+
+@lru_cache(maxsize=2048)
+def _extract_entities_cached(query: str, q: str) -> tuple:
+    entities = {}
+
+    # One pass over the raw query for code / parcel / address
+    for m in _ENTITY_RE.finditer(query):
+        group = m.lastgroup
+        if group in entities:
+            continue
+        value = m.group(group)
+        if group == "zoning_code" and (len(value) < 2 or value in _CODE_STOPWORDS):
+            continue
+        entities[group] = value
+        if len(entities) == 3:
             break
-    if "jurisdiction" not in entities:
-        for county in sorted(FL_COUNTIES, key=len, reverse=True):
-            if county.lower() in q:
-                entities["jurisdiction"] = county
+
+    # Jurisdiction: only scan when some token could start a known name.
+    # Prefer city matches (more specific), then the longest candidate.
+    if not _JUR_FIRST_TOKENS.isdisjoint(_TOKEN_RE.findall(q)):
+        best = None
+        for m in _JURISDICTION_RE.finditer(q):
+            cand = (m.lastgroup == "city", len(m.group(0)), m.group(0))
+            if best is None or cand > best:
+                best = cand
+        if best:
+            is_city, _, name = best
+            if is_city:
+                entities["jurisdiction"] = _CITIES_LC[name]
+            else:
+                entities["jurisdiction"] = _COUNTIES_LC[name]
                 entities["is_county"] = True
-                break
 
-    # Parcel ID patterns: XX XXXX-XX-XXX or numeric folio
-    parcel_match = re.search(r'\b(\d{2}\s*\d{4}-\d{2}-\d{3})\b', query)
-    if parcel_match:
-        entities["parcel_id"] = parcel_match.group(1)
+    return tuple(entities.items())
 
-    # Address pattern
-    addr_match = re.search(r'(\d+\s+[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*\s+(?:St|Ave|Blvd|Rd|Dr|Ct|Ln|Way|Pl|Cir))', query)
-    if addr_match:
-        entities["address"] = addr_match.group(1)
 
-    return entities
+def _classify_and_extract(query: str) -> tuple:
+    """Casefold once, classify, extract — the shared per-request front door."""
+    q_lower = query.casefold()
+    return classify_intent(q_lower), extract_entities(query, q_lower)
+
+
+async def classify_and_extract(query: str) -> tuple:
+    """Async wrapper: long queries run off-loop so their regex scans don't
+    stall other in-flight requests; typical queries stay synchronous to
+    avoid thread-dispatch overhead."""
+    if len(query) > 500:
+        return await asyncio.to_thread(_classify_and_extract, query)
+    return _classify_and_extract(query)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -314,37 +566,29 @@ async def agent_list_districts(entities: Dict) -> Dict:
     """List all zoning districts for a jurisdiction."""
     jurisdiction = entities.get("jurisdiction", "Satellite Beach")
 
-    # Resolve jurisdiction ID
+    # One embedded round trip: jurisdiction, its districts, and a per-district
+    # standards count via PostgREST's count aggregate — no follow-up queries.
     juris = await sb_query("jurisdictions",
-        f"select=id,name,county,data_completeness,municode_url&or=(name.ilike.%25{sanitize_param(jurisdiction)}%25,county.ilike.%25{sanitize_param(jurisdiction)}%25)",
-        limit=10)
+        f"select=id,name,county,data_completeness,municode_url,"
+        f"zoning_districts(id,code,name,category,zone_standards(count))"
+        f"&or=(name.ilike.%25{sanitize_param(jurisdiction)}%25,county.ilike.%25{sanitize_param(jurisdiction)}%25)"
+        f"&zoning_districts.order=category,code",
+        limit=10, ttl=300)
 
     if not juris:
         return {"answer": f"I couldn't find '{jurisdiction}' in our database. Try a Florida city or county name.",
                 "data": None, "citations": [], "suggestions": ["List all counties", f"Show zones in Brevard"]}
 
     j = juris[0]
-    jid = j["id"]
-
-    # Get all districts for this jurisdiction
-    districts = await sb_query("zoning_districts",
-        f"select=id,code,name,category&jurisdiction_id=eq.{jid}&order=category,code",
-        limit=200)
-
-    # Get zone_standards count
-    district_ids = [str(d["id"]) for d in districts]
-    standards_count = 0
-    if district_ids:
-        standards = await sb_query("zone_standards",
-            f"select=zoning_district_id&zoning_district_id=in.({','.join(district_ids[:50])})",
-            limit=200)
-        standards_count = len(set(s["zoning_district_id"] for s in standards))
+    districts = j.pop("zoning_districts", None) or []
+    standards_count = sum(
+        1 for d in districts
+        if (d.pop("zone_standards", None) or [{}])[0].get("count"))
 
     # Group by category
-    by_cat = {}
+    by_cat = defaultdict(list)
     for d in districts:
-        cat = d.get("category", "Other") or "Other"
-        by_cat.setdefault(cat, []).append(d)
+        by_cat[d.get("category", "Other") or "Other"].append(d)
 
     lines = [f"**{j['name']}** ({j['county']} County) — {len(districts)} zoning districts\n"]
     lines.append(f"Data completeness: {j.get('data_completeness', 0):.0f}% | "
@@ -371,6 +615,27 @@ async def agent_list_districts(entities: Dict) -> Dict:
     }
 
 
+# (column, label, unit suffix) rows for the district-detail table, in
+# display order — built once instead of per request.
+_DETAIL_FIELDS = (
+    ("min_lot_sqft", "Minimum Lot Size", " sq ft"),
+    ("min_lot_width_ft", "Minimum Lot Width", " ft"),
+    ("min_lot_depth_ft", "Minimum Lot Depth", " ft"),
+    ("max_height_ft", "Maximum Height", " ft"),
+    ("max_stories", "Maximum Stories", ""),
+    ("front_setback_ft", "Front Setback", " ft"),
+    ("side_setback_ft", "Side Setback", " ft"),
+    ("rear_setback_ft", "Rear Setback", " ft"),
+    ("corner_setback_ft", "Corner Setback", " ft"),
+    ("max_lot_coverage_pct", "Max Lot Coverage", "%"),
+    ("max_impervious_pct", "Max Impervious", "%"),
+    ("max_far", "Max FAR", ""),
+    ("max_density_du_acre", "Max Density", " du/acre"),
+    ("parking_per_unit", "Parking per Unit", " spaces"),
+    ("parking_per_1000sf", "Parking per 1,000 SF", " spaces"),
+)
+
+
 async def agent_district_detail(entities: Dict) -> Dict:
     """Get detailed dimensional standards for a zoning district."""
     code = entities.get("zoning_code")
@@ -384,11 +649,18 @@ async def agent_district_detail(entities: Dict) -> Dict:
     # Build query
     params = f"select=*&code=ilike.{sanitize_param(code)}"
     if jurisdiction:
-        juris = await sb_query("jurisdictions", f"select=id&name=ilike.%25{sanitize_param(jurisdiction)}%25", limit=1)
-        if juris:
-            params += f"&jurisdiction_id=eq.{juris[0]['id']}"
-
-    districts = await sb_query("zoning_districts", params, limit=5)
+        # No county fallback here: pinning the code search to an arbitrary
+        # first municipality of a county yields false "No district found".
+        # On a county name the ilike below misses too and the search runs
+        # unfiltered, which finds the code wherever it lives.
+        j = resolve_jurisdiction(jurisdiction, county_fallback=False)
+        if j is None:
+            juris = await sb_query("jurisdictions", f"select=id&name=ilike.%25{sanitize_param(jurisdiction)}%25", limit=1, ttl=600)
+            j = juris[0] if juris else None
+        if j:
+            params += f"&jurisdiction_id=eq.{j['id']}"
+
+    districts = await sb_query("zoning_districts", params, limit=5, ttl=300)
 
     if not districts:
         return {"answer": f"No district found with code **{code}**" + (f" in {jurisdiction}" if jurisdiction else "") + ". Check the code and try again.",
@@ -399,46 +671,32 @@ async def agent_district_detail(entities: Dict) -> Dict:
     did = district["id"]
     jid = district["jurisdiction_id"]
 
-    # Get jurisdiction name
-    juris_info = await sb_query("jurisdictions", f"select=name,county,municode_url&id=eq.{jid}", limit=1)
+    # Jurisdiction name + structured standards are independent — one RTT, not two
+    juris_info, standards = await asyncio.gather(
+        sb_query("jurisdictions", f"select=name,county,municode_url&id=eq.{jid}", limit=1, ttl=600),
+        sb_query("zone_standards", f"select=*&zoning_district_id=eq.{did}", limit=1, ttl=600),
+    )
     j = juris_info[0] if juris_info else {"name": "Unknown", "county": "Unknown"}
 
-    # Try zone_standards table first (structured data)
-    standards = await sb_query("zone_standards", f"select=*&zoning_district_id=eq.{did}", limit=1)
-
     if standards:
         s = standards[0]
-        lines = [f"## {code} — {district.get('name', 'Zoning District')}",
-                 f"**{j['name']}**, {j['county']} County\n",
-                 f"**Category:** {district.get('category', 'N/A')}\n",
-                 "### Dimensional Standards\n",
-                 "| Requirement | Value |",
-                 "|---|---|"]
-
-        field_labels = [
-            ("min_lot_sqft", "Minimum Lot Size", " sq ft"),
-            ("min_lot_width_ft", "Minimum Lot Width", " ft"),
-            ("min_lot_depth_ft", "Minimum Lot Depth", " ft"),
-            ("max_height_ft", "Maximum Height", " ft"),
-            ("max_stories", "Maximum Stories", ""),
-            ("front_setback_ft", "Front Setback", " ft"),
-            ("side_setback_ft", "Side Setback", " ft"),
-            ("rear_setback_ft", "Rear Setback", " ft"),
-            ("corner_setback_ft", "Corner Setback", " ft"),
-            ("max_lot_coverage_pct", "Max Lot Coverage", "%"),
-            ("max_impervious_pct", "Max Impervious", "%"),
-            ("max_far", "Max FAR", ""),
-            ("max_density_du_acre", "Max Density", " du/acre"),
-            ("parking_per_unit", "Parking per Unit", " spaces"),
-            ("parking_per_1000sf", "Parking per 1,000 SF", " spaces"),
-        ]
-
-        for field, label, suffix in field_labels:
+        # Write straight into one growable buffer — no list of fragments
+        # plus a final join/copy for the biggest table in the app
+        buf = io.StringIO()
+        w = buf.write
+        w(f"## {code} — {district.get('name', 'Zoning District')}")
+        w(f"\n**{j['name']}**, {j['county']} County\n")
+        w(f"\n**Category:** {district.get('category', 'N/A')}\n")
+        w("\n### Dimensional Standards\n")
+        w("\n| Requirement | Value |")
+        w("\n|---|---|")
+
+        for field, label, suffix in _DETAIL_FIELDS:
             val = s.get(field)
             if val is not None:
                 if isinstance(val, float) and val == int(val):
                     val = int(val)
-                lines.append(f"| {label} | **{val:,}{suffix}** |" if isinstance(val, (int, float)) else f"| {label} | **{val}{suffix}** |")
+                w(f"\n| {label} | **{val:,}{suffix}** |" if isinstance(val, (int, float)) else f"\n| {label} | **{val}{suffix}** |")
 
         conf_line = format_confidence(s.get("confidence_score"))
         source = s.get('source_url', '')
@@ -446,14 +704,14 @@ async def agent_district_detail(entities: Dict) -> Dict:
         if source:
             footer = (conf_line + " | " if conf_line else "") + f"[Source]({source})"
         if footer:
-            lines.append(f"\n{footer}")
+            w(f"\n\n{footer}")
 
         citations = []
         if s.get("source_url"):
             citations.append({"source": "Municode", "url": s["source_url"],
                               "title": f"{j['name']} Zoning Ordinance"})
 
-        return {"answer": "\n".join(lines),
+        return {"answer": buf.getvalue(),
                 "data": {"district": district, "standards": s, "jurisdiction": j},
                 "citations": citations,
                 "suggestions": [f"Compare {code} with another zone", f"List all zones in {j['name']}"]}
@@ -491,19 +749,135 @@ async def agent_district_detail(entities: Dict) -> Dict:
     }
 
 
-async def agent_comparison(entities: Dict) -> Dict:
-    """Compare two zoning districts."""
-    # Extract both codes from query
-    code = entities.get("zoning_code")
-    if not code:
+_COMPARISON_FIELDS = (
+    ("min_lot_sqft", "Min Lot Size", " sq ft"),
+    ("min_lot_width_ft", "Min Lot Width", " ft"),
+    ("max_height_ft", "Max Height", " ft"),
+    ("front_setback_ft", "Front Setback", " ft"),
+    ("side_setback_ft", "Side Setback", " ft"),
+    ("rear_setback_ft", "Rear Setback", " ft"),
+    ("max_lot_coverage_pct", "Max Lot Coverage", "%"),
+    ("max_density_du_acre", "Max Density", " du/acre"),
+)
+
+
+def _fmt_standard(val, suffix: str) -> str:
+    if val is None:
+        return "—"
+    if isinstance(val, float) and val == int(val):
+        val = int(val)
+    return f"{val:,}{suffix}" if isinstance(val, (int, float)) else f"{val}{suffix}"
+
+
+async def agent_comparison(query: str, entities: Dict) -> Dict:
+    """Compare two zoning districts side by side."""
+    # Both codes come out of the single entity-scanner pass
+    codes: List[str] = []
+    for m in _ENTITY_RE.finditer(query):
+        if m.lastgroup == "zoning_code":
+            c = m.group("zoning_code")
+            if len(c) >= 2 and c not in _CODE_STOPWORDS and c not in codes:
+                codes.append(c)
+                if len(codes) == 2:
+                    break
+
+    if not codes:
         return {"answer": "Please specify two zoning codes to compare, e.g. 'Compare RS-1 vs C-2'",
                 "data": None, "citations": [],
                 "suggestions": ["Compare RS-1 vs RS-2", "Compare BU-1 vs BU-2"]}
 
-    # For now, show the one we found and ask for the second
-    result = await agent_district_detail(entities)
-    result["answer"] = result["answer"] + "\n\n_Specify a second zone code to complete the comparison._"
-    return result
+    if len(codes) == 1:
+        # Show the one we found and ask for the second
+        result = await agent_district_detail(entities)
+        result["answer"] = result["answer"] + "\n\n_Specify a second zone code to complete the comparison._"
+        return result
+
+    # Both districts + their standards in one embedded round trip
+    rows = await sb_query("zoning_districts",
+        f"select=id,code,name,category,zone_standards(*)"
+        f"&code=in.({sanitize_param(codes[0])},{sanitize_param(codes[1])})",
+        limit=4)
+
+    by_code: Dict[str, Dict] = {}
+    for r in rows:
+        by_code.setdefault(r["code"].upper(), r)
+    a = by_code.get(codes[0].upper())
+    b = by_code.get(codes[1].upper())
+
+    if not a or not b:
+        missing = codes[0] if not a else codes[1]
+        return {"answer": f"I couldn't find **{missing}** to compare. Check the code and try again.",
+                "data": None, "citations": [],
+                "suggestions": [f"What are the requirements for {codes[0]}?",
+                                f"List zones in Satellite Beach"]}
+
+    sa = (a.get("zone_standards") or [{}])[0]
+    sb = (b.get("zone_standards") or [{}])[0]
+
+    lines = [f"## {a['code']} vs {b['code']}\n",
+             f"| Requirement | {a['code']} | {b['code']} |",
+             "|---|---|---|",
+             f"| Name | {a.get('name', 'N/A')} | {b.get('name', 'N/A')} |",
+             f"| Category | {a.get('category', 'N/A')} | {b.get('category', 'N/A')} |"]
+
+    for field, label, suffix in _COMPARISON_FIELDS:
+        va, vb = sa.get(field), sb.get(field)
+        if va is None and vb is None:
+            continue
+        lines.append(f"| {label} | {_fmt_standard(va, suffix)} | {_fmt_standard(vb, suffix)} |")
+
+    if not sa and not sb:
+        lines.append("\n_Dimensional standards haven't been extracted yet for these districts._")
+
+    return {"answer": "\n".join(lines),
+            "data": {"districts": [a, b]},
+            "citations": [],
+            "suggestions": [f"Requirements for {a['code']}",
+                            f"Requirements for {b['code']}"]}
+
+
+# ── Parcel lookup coalescer ─────────────────────────────────────
+# Map UIs fire dozens of concurrent parcel lookups while panning. Lookups
+# that arrive within a 10ms window are merged into one parcel_id=in.(...)
+# query and fanned back out to their waiters.
+
+_parcel_pending: Dict[str, asyncio.Future] = {}
+_parcel_flush_scheduled = False
+_PARCEL_FLUSH_WINDOW = 0.01  # seconds
+
+
+async def _parcel_flush():
+    global _parcel_flush_scheduled
+    await asyncio.sleep(_PARCEL_FLUSH_WINDOW)
+    pending = dict(_parcel_pending)
+    _parcel_pending.clear()
+    _parcel_flush_scheduled = False
+    try:
+        rows = await sb_query("parcel_zones",
+            f"select=*&parcel_id=in.({','.join(pending)})", limit=len(pending))
+    except Exception as e:
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(e)
+        return
+    by_id = {r.get("parcel_id"): r for r in rows}
+    for pid, fut in pending.items():
+        if not fut.done():
+            fut.set_result(by_id.get(pid))
+
+
+async def lookup_parcel(parcel_id: str) -> Optional[Dict]:
+    """Look up one parcel, coalescing concurrent lookups into one query."""
+    global _parcel_flush_scheduled
+    pid = sanitize_param(parcel_id)
+    fut = _parcel_pending.get(pid)
+    if fut is None:
+        fut = asyncio.get_running_loop().create_future()
+        _parcel_pending[pid] = fut
+        if not _parcel_flush_scheduled:
+            _parcel_flush_scheduled = True
+            asyncio.create_task(_parcel_flush())
+    return await fut
 
 
 async def agent_parcel_lookup(entities: Dict) -> Dict:
@@ -515,14 +889,12 @@ async def agent_parcel_lookup(entities: Dict) -> Dict:
                 "data": None, "citations": [],
                 "suggestions": ["What zone is parcel 29 3712-00-529?", "Zoning at 123 Main St Satellite Beach"]}
 
-    parcels = await sb_query("parcel_zones", f"select=*&parcel_id=eq.{parcel_id}", limit=1)
+    p = await lookup_parcel(parcel_id)
 
-    if not parcels:
+    if not p:
         return {"answer": f"Parcel **{parcel_id}** not found in our database. It may not have been scraped yet.",
                 "data": None, "citations": [],
                 "suggestions": ["Try a different parcel ID", "List zones in Satellite Beach"]}
-
-    p = parcels[0]
     lines = [f"## Parcel: {p['parcel_id']}",
              f"• **Zone Code:** {p.get('zone_code', 'N/A')}",
              f"• **Zone Name:** {p.get('zone_name', 'N/A')}",
@@ -547,11 +919,7 @@ async def agent_county_stats(entities: Dict) -> Dict:
         county = entities.get("jurisdiction")
     elif entities.get("jurisdiction"):
         # Check if the jurisdiction name is actually a county
-        jname = entities["jurisdiction"]
-        for c in FL_COUNTIES:
-            if c.lower() == jname.lower():
-                county = c
-                break
+        county = _COUNTIES_LC.get(entities["jurisdiction"].casefold())
 
     if county:
         # County-specific stats
@@ -563,30 +931,49 @@ async def agent_county_stats(entities: Dict) -> Dict:
         district_count = 0
         standards_count = 0
         if jids:
-            districts = await sb_query("zoning_districts",
-                f"select=id&jurisdiction_id=in.({','.join(jids)})",
-                limit=1000)
-            district_count = len(districts)
-            dids = [str(d["id"]) for d in districts]
-            if dids:
-                standards = await sb_query("zone_standards",
-                    f"select=id&zoning_district_id=in.({','.join(dids[:200])})",
-                    limit=1000)
-                standards_count = len(standards)
-
-        lines = [f"## {county} County — Zoning Data\n",
-                 f"**{len(juris)}** jurisdictions | **{district_count:,}** zoning districts | **{standards_count:,}** dimensional standards\n",
-                 "### Jurisdictions\n",
-                 "| Jurisdiction | Data Completeness |",
-                 "|---|---|"]
+            # One aggregate in Postgres (migrations/20260901_county_counts_rpc.sql);
+            # fall back to the REST fan-out until the migration is applied.
+            try:
+                counts = await sb_rpc("counts_by_county",
+                                      {"p_county": county}, ttl=60)
+                row = counts[0] if counts else {}
+                district_count = row.get("districts") or 0
+                standards_count = row.get("standards") or 0
+            except Exception:
+                districts = await sb_query("zoning_districts",
+                    f"select=id&jurisdiction_id=in.({','.join(jids)})",
+                    limit=2000)
+                district_count = len(districts)
+                dids = [str(d["id"]) for d in districts]
+                if dids:
+                    # Header-only counts, chunked so large counties are not
+                    # silently truncated and no in.() list outgrows URL limits.
+                    chunks = [dids[i:i + 200] for i in range(0, len(dids), 200)]
+                    counts = await asyncio.gather(*(
+                        sb_count("zone_standards",
+                                 f"zoning_district_id=in.({','.join(c)})",
+                                 select="zoning_district_id")
+                        for c in chunks))
+                    standards_count = sum(counts)
+
+        # Written straight into one buffer — the jurisdiction table can run
+        # to 200 rows, so skip the intermediate list plus join copy
+        buf = io.StringIO()
+        w = buf.write
+        w(f"## {county} County — Zoning Data\n")
+        w(f"\n**{len(juris)}** jurisdictions | **{district_count:,}** zoning districts | **{standards_count:,}** dimensional standards\n")
+        w("\n### Jurisdictions\n")
+        w("\n| Jurisdiction | Data Completeness |")
+        w("\n|---|---|")
 
         for j in juris:
             comp = j.get("data_completeness", 0) or 0
-            lines.append(f"| {j['name']} | {comp:.0f}% |")
+            w(f"\n| {j['name']} | {comp:.0f}% |")
 
-        lines.append(f"\n_Ask about any jurisdiction: \"Show zones in {juris[0]['name']}\"_" if juris else "")
+        if juris:
+            w(f"\n\n_Ask about any jurisdiction: \"Show zones in {juris[0]['name']}\"_")
 
-        return {"answer": "\n".join(lines),
+        return {"answer": buf.getvalue(),
                 "data": {"county": county, "jurisdictions": len(juris),
                          "districts": district_count, "standards": standards_count,
                          "jurisdiction_list": [j["name"] for j in juris]},
@@ -594,35 +981,44 @@ async def agent_county_stats(entities: Dict) -> Dict:
                 "suggestions": [f"Show zones in {juris[0]['name']}" if juris else "List all counties",
                                 f"What zones are in {county} County?"]}
 
-    # Statewide stats (no county specified)
-    juris_count = await sb_count("jurisdictions")
-    district_count = await sb_count("zoning_districts")
-    standards_count = await sb_count("zone_standards")
-    parcel_count = await sb_count("parcel_zones")
-
-    top = await sb_query("jurisdictions",
-        "select=county,data_completeness&data_completeness=gte.90&order=data_completeness.desc",
-        limit=200)
-
-    from collections import Counter
-    county_counts = Counter(j["county"] for j in top)
-
-    lines = ["## ZoneWise.AI — Florida Coverage\n",
-             "| Metric | Count |",
-             "|---|---|",
-             f"| Counties | **67** |",
-             f"| Jurisdictions | **{juris_count:,}** |",
-             f"| Zoning Districts | **{district_count:,}** |",
-             f"| Dimensional Standards | **{standards_count:,}** |",
-             f"| Parcel Assignments | **{parcel_count:,}** |",
-             f"| Jurisdictions at 90%+ | **{len(top)}** |",
-             f"\n### Top Counties (by 90%+ jurisdictions)\n"]
-
-    for county_name, count in county_counts.most_common(10):
-        lines.append(f"• **{county_name}:** {count} jurisdictions at 90%+")
-
-    return {"answer": "\n".join(lines), "data": {"jurisdictions": juris_count, "districts": district_count,
-            "standards": standards_count, "parcels": parcel_count, "high_complete": len(top)},
+    # Statewide stats (no county specified) — all five queries are independent
+    juris_count, district_count, standards_count, parcel_count, high_complete = await asyncio.gather(
+        sb_count("jurisdictions", ttl=60),
+        sb_count("zoning_districts", ttl=60),
+        sb_count("zone_standards", ttl=60),
+        sb_count("parcel_zones", ttl=60),
+        sb_count("jurisdictions", "data_completeness=gte.90", ttl=60),
+    )
+
+    # Per-county grouping happens in Postgres (migrations/20260901_top_counties_rpc.sql);
+    # fall back to fetching rows and counting locally if the RPC is not deployed yet.
+    try:
+        top_counties = [(r["county"], r["jurisdictions"])
+                        for r in await sb_rpc("top_counties_90", ttl=60)]
+    except Exception:
+        top = await sb_query("jurisdictions",
+            "select=county,data_completeness&data_completeness=gte.90&order=data_completeness.desc",
+            limit=200, ttl=60)
+        top_counties = Counter(j["county"] for j in top).most_common(10)
+
+    buf = io.StringIO()
+    w = buf.write
+    w("## ZoneWise.AI — Florida Coverage\n")
+    w("\n| Metric | Count |")
+    w("\n|---|---|")
+    w(f"\n| Counties | **67** |")
+    w(f"\n| Jurisdictions | **{juris_count:,}** |")
+    w(f"\n| Zoning Districts | **{district_count:,}** |")
+    w(f"\n| Dimensional Standards | **{standards_count:,}** |")
+    w(f"\n| Parcel Assignments | **{parcel_count:,}** |")
+    w(f"\n| Jurisdictions at 90%+ | **{high_complete}** |")
+    w("\n\n### Top Counties (by 90%+ jurisdictions)\n")
+
+    for county_name, count in top_counties:
+        w(f"\n• **{county_name}:** {count} jurisdictions at 90%+")
+
+    return {"answer": buf.getvalue(), "data": {"jurisdictions": juris_count, "districts": district_count,
+            "standards": standards_count, "parcels": parcel_count, "high_complete": high_complete},
             "citations": [], "suggestions": ["List zones in Tampa", "Show zones in Palm Beach"]}
 
 
@@ -640,7 +1036,7 @@ async def agent_general(query: str, entities: Dict) -> Dict:
     client = get_anthropic()
     if client:
         try:
-            stats_data = await get_stats()
+            stats_data = await cached_stats()
             system = CLAUDE_SYSTEM_PROMPT.format(stats=json.dumps(stats_data, default=str))
             message = await client.messages.create(
                 model="claude-sonnet-4-5-20250929",
@@ -669,7 +1065,49 @@ async def agent_general(query: str, entities: Dict) -> Dict:
 
 
 
-async def agent_address_query(query: str, entities: Dict) -> Dict:
+# Canonical permission_code values (denormalized at ingest by
+# migrations/20260901_permission_code.sql) map straight to a bucket index:
+# 0 = permitted, 1 = conditional, 2 = prohibited. The permission_type
+# variants stay as fallback for rows written before the migration.
+_PERMISSION_BUCKETS = {
+    "P": 0, "permitted": 0, "by-right": 0,
+    "C": 1, "conditional": 1, "CU": 1,
+    "N": 2, "prohibited": 2, "not-permitted": 2,
+}
+_PERMISSION_CAPS = (4, 3, 3)
+
+
+# Dimensional-standard fields the address answer renders, with their labels
+# and formatters. Built once at import; previously the list (and its seven
+# lambdas) was reallocated for every district in the response loop.
+def _fmt_sqft(v):
+    return f"{int(v):,} sq ft"
+
+
+def _fmt_ft(v):
+    return f"{v} ft"
+
+
+def _fmt_pct(v):
+    return f"{v}%"
+
+
+def _fmt_du_acre(v):
+    return f"{v} du/acre"
+
+
+_STANDARD_FIELDS = (
+    ("min_lot_sqft",         "Min Lot Size",     _fmt_sqft),
+    ("front_setback_ft",     "Front Setback",    _fmt_ft),
+    ("side_setback_ft",      "Side Setback",     _fmt_ft),
+    ("rear_setback_ft",      "Rear Setback",     _fmt_ft),
+    ("max_height_ft",        "Max Height",       _fmt_ft),
+    ("max_lot_coverage_pct", "Max Lot Coverage", _fmt_pct),
+    ("max_density_du_acre",  "Max Density",      _fmt_du_acre),
+)
+
+
+async def agent_address_query_stream(query: str, entities: Dict):
     """
     Handle address/property queries: "What can I build at 625 Ocean St Satellite Beach?"
     Strategy:
@@ -679,96 +1117,103 @@ async def agent_address_query(query: str, entities: Dict) -> Dict:
       4. Get dimensional standards for residential districts (most likely for address queries)
       5. Get permitted uses if available
       6. Return real data — never hallucinate standards
+
+    Async generator: yields {"type": "answer_section", "value": block} frames
+    as each markdown block is ready (header first, then one per category,
+    then the footer), and finishes with {"type": "result", "value": {...}}
+    carrying data/citations/suggestions. /chat/stream forwards sections as
+    they arrive; agent_address_query buffers them for the JSON endpoints.
     """
     jurisdiction = entities.get("jurisdiction")
 
     if not jurisdiction:
-        return {
-            "answer": (
-                "I need a city or area name to look up zoning. Try:\n\n"
-                "• _What can I build in **Satellite Beach**?_\n"
-                "• _What's the zoning at 625 Ocean St, **Cocoa Beach**?_\n"
-                "• _Development rules in **Melbourne**?_"
-            ),
+        yield {"type": "answer_section", "value": (
+            "I need a city or area name to look up zoning. Try:\n\n"
+            "• _What can I build in **Satellite Beach**?_\n"
+            "• _What's the zoning at 625 Ocean St, **Cocoa Beach**?_\n"
+            "• _Development rules in **Melbourne**?_"
+        )}
+        yield {"type": "result", "value": {
             "data": None, "citations": [],
             "suggestions": ["What can I build in Satellite Beach?",
                             "Zoning rules in Cocoa Beach",
-                            "What zones are in Brevard County?"]
-        }
-
-    # ── Step 1: Resolve jurisdiction ────────────────────────────────────────
-    juris_rows = await sb_query(
-        "jurisdictions",
-        f"select=id,name,county,data_completeness,municode_url"
-        f"&or=(name.ilike.%25{sanitize_param(jurisdiction)}%25,county.ilike.%25{sanitize_param(jurisdiction)}%25)",
-        limit=5
-    )
+                            "What zones are in Brevard County?"]}}
+        return
+
+    # ── Steps 1-4: One round trip ───────────────────────────────────────────
+    # Preferred path: resolve via the primed name map, then call the
+    # districts_for_address RPC (migrations/20260902_districts_for_address_rpc.sql),
+    # which ranks and caps districts in Postgres and embeds standards and uses
+    # for only the rows the answer will render. Fallback: a PostgREST embedded
+    # select that returns the full uncapped graph in one response.
+    districts = total_districts = None
+    j = resolve_jurisdiction(jurisdiction)
+    if j is not None:
+        try:
+            payload = await sb_rpc("districts_for_address",
+                                   {"p_jid": j["id"]}, ttl=300)
+            districts = (payload or {}).get("districts") or []
+            total_districts = (payload or {}).get("total") or len(districts)
+        except Exception:
+            districts = None
+
+    if districts is None:
+        jp = sanitize_param(jurisdiction)
+        juris_rows = await sb_query(
+            "jurisdictions",
+            f"select=id,name,county,data_completeness,municode_url,"
+            f"zoning_districts(id,code,name,category,description,zone_standards(*),"
+            # permission_code is deliberately absent here: the column only
+            # exists once 20260901_permission_code.sql is applied, and this
+            # fallback is exactly the pre-migration path. Selecting it would
+            # 400 the whole query; the bucket lookup maps permission_type.
+            f"permitted_uses(zoning_district_id,use_type,use_name,permission_type))"
+            f"&or=(name.ilike.%25{jp}%25,county.ilike.%25{jp}%25)"
+            f"&zoning_districts.order=category,code"
+            f"&zoning_districts.permitted_uses.order=permission_type,use_name",
+            limit=3, ttl=300
+        )
 
-    if not juris_rows:
-        return {
-            "answer": (
+        if not juris_rows:
+            yield {"type": "answer_section", "value": (
                 f"I couldn't find **{jurisdiction}** in our Florida database.\n\n"
                 f"Try the county name (e.g. _Brevard County_) or a nearby city."
-            ),
-            "data": None, "citations": [],
-            "suggestions": [f"Show zones in Brevard County",
-                            "What counties do you cover?"]
-        }
-
-    # Prefer exact name match, fall back to first result
-    j = next((r for r in juris_rows if r["name"].lower() == jurisdiction.lower()), juris_rows[0])
-    jid = j["id"]
+            )}
+            yield {"type": "result", "value": {
+                "data": None, "citations": [],
+                "suggestions": [f"Show zones in Brevard County",
+                                "What counties do you cover?"]}}
+            return
 
-    # ── Step 2: Get all zoning districts ────────────────────────────────────
-    districts = await sb_query(
-        "zoning_districts",
-        f"select=id,code,name,category,description&jurisdiction_id=eq.{jid}&order=category,code",
-        limit=200
-    )
+        # Prefer exact name match, fall back to first result
+        j = next((r for r in juris_rows if r["name"].lower() == jurisdiction.lower()), juris_rows[0])
+        districts = j.pop("zoning_districts", None) or []
+        total_districts = len(districts)
 
     if not districts:
-        return {
-            "answer": (
-                f"**{j['name']}** ({j['county']} County) is in our database but "
-                f"zoning districts haven't been loaded yet.\n\n"
-                f"Data completeness: {j.get('data_completeness', 0):.0f}%\n\n"
-                f"Check back soon — our scraper processes all 67 FL counties nightly."
-            ),
+        yield {"type": "answer_section", "value": (
+            f"**{j['name']}** ({j['county']} County) is in our database but "
+            f"zoning districts haven't been loaded yet.\n\n"
+            f"Data completeness: {j.get('data_completeness', 0):.0f}%\n\n"
+            f"Check back soon — our scraper processes all 67 FL counties nightly."
+        )}
+        yield {"type": "result", "value": {
             "data": {"jurisdiction": j}, "citations": [],
             "suggestions": [f"Show zones in {j['county']} County",
-                            "Which counties have full data?"]
-        }
+                            "Which counties have full data?"]}}
+        return
 
-    # ── Step 3: Get dimensional standards for districts ──────────────────────
-    district_ids = [str(d["id"]) for d in districts]
+    # Unpack the embedded children into the per-district maps
     standards_map: Dict[str, Dict] = {}
-
-    if district_ids:
-        # Fetch standards in batches of 50
-        for i in range(0, min(len(district_ids), 100), 50):
-            batch = district_ids[i:i+50]
-            standards = await sb_query(
-                "zone_standards",
-                f"select=*&zoning_district_id=in.({','.join(batch)})",
-                limit=200
-            )
-            for s in standards:
-                standards_map[str(s["zoning_district_id"])] = s
-
-    # ── Step 4: Get permitted uses ───────────────────────────────────────────
     uses_map: Dict[str, list] = {}
-    if district_ids:
-        for i in range(0, min(len(district_ids), 50), 50):
-            batch = district_ids[i:i+50]
-            uses = await sb_query(
-                "permitted_uses",
-                f"select=zoning_district_id,use_type,use_name,permission_type"
-                f"&zoning_district_id=in.({','.join(batch)})&order=permission_type,use_name",
-                limit=500
-            )
-            for u in uses:
-                did = str(u["zoning_district_id"])
-                uses_map.setdefault(did, []).append(u)
+    for d in districts:
+        did = str(d["id"])
+        stds = d.pop("zone_standards", None)
+        if stds:
+            standards_map[did] = stds[0]
+        u_rows = d.pop("permitted_uses", None)
+        if u_rows:
+            uses_map[did] = u_rows
 
     # ── Step 5: Build response ───────────────────────────────────────────────
     # Group districts by category
@@ -781,12 +1226,12 @@ async def agent_address_query(query: str, entities: Dict) -> Dict:
     addr_match = entities.get("address", "")
     location_line = f"**{addr_match}, {j['name']}**" if addr_match else f"**{j['name']}**"
 
-    lines = [
-        f"## {location_line}",
+    yield {"type": "answer_section", "value": (
+        f"## {location_line}\n"
         f"**County:** {j['county']} | "
         f"**Data completeness:** {j.get('data_completeness', 0):.0f}% | "
-        f"**{len(districts)} zoning districts**\n",
-    ]
+        f"**{total_districts} zoning districts**\n"
+    )}
 
     has_standards = bool(standards_map)
 
@@ -797,72 +1242,74 @@ async def agent_address_query(query: str, entities: Dict) -> Dict:
 
     for cat in ordered_cats[:4]:  # Cap at 4 categories for readability
         dists = by_cat[cat]
-        lines.append(f"### {cat} Districts\n")
+        # Write each section straight into one growable buffer — no list of
+        # fragments plus a join pass (same pattern as agent_district_detail)
+        buf = io.StringIO()
+        w = buf.write
+        w(f"### {cat} Districts\n")
 
         for d in dists[:6]:  # Cap at 6 districts per category
             did_str = str(d["id"])
             s = standards_map.get(did_str)
             u_list = uses_map.get(did_str, [])
 
-            lines.append(f"**{d['code']}** — {d.get('name', '')}\n")
+            w(f"\n**{d['code']}** — {d.get('name', '')}\n")
 
             if s:
                 # Show key dimensional standards
-                std_rows = []
-                field_map = [
-                    ("min_lot_sqft",        "Min Lot Size",    lambda v: f"{int(v):,} sq ft"),
-                    ("front_setback_ft",    "Front Setback",   lambda v: f"{v} ft"),
-                    ("side_setback_ft",     "Side Setback",    lambda v: f"{v} ft"),
-                    ("rear_setback_ft",     "Rear Setback",    lambda v: f"{v} ft"),
-                    ("max_height_ft",       "Max Height",      lambda v: f"{v} ft"),
-                    ("max_lot_coverage_pct","Max Lot Coverage",lambda v: f"{v}%"),
-                    ("max_density_du_acre", "Max Density",     lambda v: f"{v} du/acre"),
-                ]
-                for field, label, fmt in field_map:
+                wrote_table = False
+                for field, label, fmt in _STANDARD_FIELDS:
                     val = s.get(field)
-                    if val is not None:
-                        std_rows.append(f"| {label} | **{fmt(val)}** |")
-
-                if std_rows:
-                    lines.append("| Requirement | Value |")
-                    lines.append("|---|---|")
-                    lines.extend(std_rows)
+                    if val is None:
+                        continue
+                    if not wrote_table:
+                        w("\n| Requirement | Value |\n|---|---|")
+                        wrote_table = True
+                    w(f"\n| {label} | **{fmt(val)}** |")
 
                 conf_line = format_confidence(s.get("confidence_score"))
                 if conf_line:
-                    lines.append(conf_line + "\n")
+                    w(f"\n{conf_line}\n")
             else:
-                lines.append("_Dimensional standards pending for this district_\n")
+                w("\n_Dimensional standards pending for this district_\n")
 
-            # Permitted uses summary
+            # Permitted uses summary — one pass over u_list, dispatching each
+            # row into its bucket instead of three filtered scans
             if u_list:
-                permitted = [u["use_name"] for u in u_list if u.get("permission_type") in ("P", "permitted", "by-right")][:4]
-                conditional = [u["use_name"] for u in u_list if u.get("permission_type") in ("C", "conditional", "CU")][:3]
-                prohibited = [u["use_name"] for u in u_list if u.get("permission_type") in ("N", "prohibited", "not-permitted")][:3]
+                permitted, conditional, prohibited = buckets = ([], [], [])
+                for u in u_list:
+                    idx = _PERMISSION_BUCKETS.get(
+                        u.get("permission_code") or u.get("permission_type"))
+                    if idx is not None and len(buckets[idx]) < _PERMISSION_CAPS[idx]:
+                        buckets[idx].append(u["use_name"])
 
                 if permitted:
-                    lines.append(f"✅ **Permitted:** {', '.join(permitted)}")
+                    w(f"\n✅ **Permitted:** {', '.join(permitted)}")
                 if conditional:
-                    lines.append(f"⚠️ **Conditional:** {', '.join(conditional)}")
+                    w(f"\n⚠️ **Conditional:** {', '.join(conditional)}")
                 if prohibited:
-                    lines.append(f"❌ **Not Permitted:** {', '.join(prohibited)}")
-                lines.append("")
+                    w(f"\n❌ **Not Permitted:** {', '.join(prohibited)}")
+                w("\n")
 
-        lines.append("")
+        w("\n")
+        yield {"type": "answer_section", "value": buf.getvalue()}
 
     # Footer
-    lines.append("---")
+    buf = io.StringIO()
+    w = buf.write
+    w("---")
     if not has_standards:
-        lines.append(
-            "> ⚠️ Dimensional standards for this jurisdiction are still being processed. "
+        w(
+            "\n> ⚠️ Dimensional standards for this jurisdiction are still being processed. "
             "Districts shown are real — setback/height data coming soon."
         )
-    lines.append(
-        f"_For exact parcel zoning, provide your parcel ID or visit "
+    w(
+        f"\n_For exact parcel zoning, provide your parcel ID or visit "
         f"[Brevard Property Appraiser](https://www.bcpao.us) / county GIS._"
         if j["county"] == "Brevard"
-        else f"_For exact parcel zoning, provide your parcel ID or visit {j['county']} County GIS._"
+        else f"\n_For exact parcel zoning, provide your parcel ID or visit {j['county']} County GIS._"
     )
+    yield {"type": "answer_section", "value": buf.getvalue()}
 
     citations = []
     if j.get("municode_url"):
@@ -878,11 +1325,10 @@ async def agent_address_query(query: str, entities: Dict) -> Dict:
         districts[0] if districts else None
     )
 
-    return {
-        "answer": "\n".join(lines),
+    yield {"type": "result", "value": {
         "data": {
             "jurisdiction": j,
-            "district_count": len(districts),
+            "district_count": total_districts,
             "standards_count": len(standards_map),
             "categories": {k: len(v) for k, v in by_cat.items()}
         },
@@ -892,65 +1338,97 @@ async def agent_address_query(query: str, entities: Dict) -> Dict:
             f"What can I build in {j['county']} County?",
             f"Compare zones in {j['name']}",
         ]
-    }
+    }}
+
+
+async def agent_address_query(query: str, entities: Dict) -> Dict:
+    """Buffered view of agent_address_query_stream for the JSON endpoints."""
+    sections: List[str] = []
+    result: Dict = {}
+    async for frame in agent_address_query_stream(query, entities):
+        if frame["type"] == "result":
+            result = dict(frame["value"])
+        else:
+            sections.append(frame["value"])
+    result["answer"] = "\n".join(sections)
+    return result
 
 # ═══════════════════════════════════════════════════════════════
 # AGENT ROUTER
 # ═══════════════════════════════════════════════════════════════
 
-AGENT_MAP = {
-    "LIST_DISTRICTS":  lambda q, e: agent_list_districts(e),
-    "DISTRICT_DETAIL": lambda q, e: agent_district_detail(e),
-    "COMPARISON":      lambda q, e: agent_comparison(e),
-    "FEASIBILITY":     lambda q, e: agent_district_detail(e),
-    "ADDRESS_QUERY":   lambda q, e: agent_address_query(q, e),
-    "PARCEL_LOOKUP":   lambda q, e: agent_parcel_lookup(e),
-    "COUNTY_STATS":    lambda q, e: agent_county_stats(e),
-    "GENERAL":         agent_general,
-}
+# Dispatch table indexed by Intent value — no dict hash on the hot path.
+_AGENT_TABLE = (
+    agent_comparison,                       # COMPARISON
+    lambda q, e: agent_address_query(q, e), # ADDRESS_QUERY
+    lambda q, e: agent_district_detail(e),  # FEASIBILITY
+    lambda q, e: agent_list_districts(e),   # LIST_DISTRICTS
+    lambda q, e: agent_district_detail(e),  # DISTRICT_DETAIL
+    lambda q, e: agent_parcel_lookup(e),    # PARCEL_LOOKUP
+    agent_general,                          # REPORT — no dedicated handler yet
+    lambda q, e: agent_county_stats(e),     # COUNTY_STATS
+    agent_general,                          # GENERAL
+)
+assert len(_AGENT_TABLE) == len(Intent)
+
+_STRUCTURED_INTENTS = frozenset((
+    Intent.LIST_DISTRICTS, Intent.DISTRICT_DETAIL, Intent.ADDRESS_QUERY,
+    Intent.PARCEL_LOOKUP, Intent.COUNTY_STATS,
+))
 
 
 # ═══════════════════════════════════════════════════════════════
 # ENDPOINTS
 # ═══════════════════════════════════════════════════════════════
 
+# Everything in /health except the timestamp, and the whole /agents payload,
+# is static — build once at import instead of per request.
+_HEALTH_BASE = {
+    "status": "healthy" if SUPABASE_KEY else "degraded",
+    "database": "connected" if SUPABASE_KEY else "no_key",
+    "version": "1.1.0",
+    "counties": 67,
+}
+
+_AGENTS_RESPONSE = [
+    {"name": "ZoningResearchAgent", "intents": ["LIST_DISTRICTS", "DISTRICT_DETAIL", "COMPARISON", "FEASIBILITY"],
+     "description": "Zoning codes, setbacks, height limits, density, FAR, permitted uses"},
+    {"name": "ParcelAnalysisAgent", "intents": ["PARCEL_LOOKUP"],
+     "description": "Parcel-to-zone mapping and property analysis"},
+    {"name": "StatsAgent", "intents": ["COUNTY_STATS"],
+     "description": "Platform coverage and data statistics"},
+    {"name": "ReportAgent", "intents": ["REPORT"],
+     "description": "Generate zoning reports (PDF/DOCX)"},
+]
+
+
 @app.get("/health")
 async def health():
-    db_ok = bool(SUPABASE_KEY)
-    return {
-        "status": "healthy" if db_ok else "degraded",
-        "database": "connected" if db_ok else "no_key",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.1.0",
-        "counties": 67,
-    }
+    return {**_HEALTH_BASE, "timestamp": datetime.utcnow().isoformat()}
+
+
+_AGENTS_BODY = orjson.dumps(_AGENTS_RESPONSE)
+_AGENTS_HEADERS = {"Cache-Control": "public, max-age=3600"}
 
 
 @app.get("/agents")
 async def list_agents():
-    return [
-        {"name": "ZoningResearchAgent", "intents": ["LIST_DISTRICTS", "DISTRICT_DETAIL", "COMPARISON", "FEASIBILITY"],
-         "description": "Zoning codes, setbacks, height limits, density, FAR, permitted uses"},
-        {"name": "ParcelAnalysisAgent", "intents": ["PARCEL_LOOKUP"],
-         "description": "Parcel-to-zone mapping and property analysis"},
-        {"name": "StatsAgent", "intents": ["COUNTY_STATS"],
-         "description": "Platform coverage and data statistics"},
-        {"name": "ReportAgent", "intents": ["REPORT"],
-         "description": "Generate zoning reports (PDF/DOCX)"},
-    ]
+    # Payload is static: serve pre-serialized bytes and let clients cache.
+    return Response(content=_AGENTS_BODY, media_type="application/json",
+                    headers=_AGENTS_HEADERS)
 
 
 @app.post("/agents/query", response_model=ChatResponse)
 async def query_agents(req: ChatRequest):
-    intent = classify_intent(req.query)
-    entities = extract_entities(req.query)
+    intent, entities = await classify_and_extract(req.query)
 
-    handler = AGENT_MAP.get(intent, agent_general)
+    handler = _AGENT_TABLE[intent]
     result = await handler(req.query, entities)
 
-    return ChatResponse(
+    # The agents build these dicts themselves; skip response-side validation.
+    return ChatResponse.model_construct(
         answer=result.get("answer", "I couldn't process that query."),
-        intent=intent,
+        intent=intent.name,
         entities=entities,
         data=result.get("data"),
         citations=result.get("citations", []),
@@ -964,73 +1442,117 @@ async def chat_endpoint(req: ChatRequest):
     return await query_agents(req)
 
 
+async def _build_chat_context(entities: Dict) -> str:
+    """Supabase context for the Claude prompt. The jurisdiction and
+    zoning-code chains are independent of each other, so they run
+    concurrently; each chain embeds its child rows in the parent select,
+    so the whole context costs one round trip of latency instead of four."""
+    async def _jurisdiction_context() -> List[str]:
+        parts = []
+        jname = entities.get("jurisdiction")
+        if not jname:
+            return parts
+        jurs = await sb_query("jurisdictions",
+            f"select=id,name,county,zoning_districts(code,name,category)"
+            f"&name=ilike.%25{sanitize_param(jname)}%25"
+            f"&zoning_districts.limit=20", limit=3)
+        if jurs:
+            dists_by_name = {j["name"]: j.pop("zoning_districts", None) for j in jurs}
+            parts.append(f"Jurisdictions: {json.dumps(jurs)}")
+            for j in jurs[:1]:
+                dists = dists_by_name.get(j["name"])
+                if dists:
+                    parts.append(f"Districts in {j['name']}: {json.dumps(dists)}")
+        return parts
+
+    async def _code_context() -> List[str]:
+        parts = []
+        zcode = entities.get("zoning_code")
+        if not zcode:
+            return parts
+        dists = await sb_query("zoning_districts",
+            f"select=id,code,name,description,category,zone_standards(*)"
+            f"&code=ilike.{sanitize_param(zcode)}"
+            f"&zone_standards.limit=1", limit=3)
+        if dists:
+            stds = [d.pop("zone_standards", None) for d in dists]
+            parts.append(f"District data: {json.dumps(dists)}")
+            if stds and stds[0]:
+                parts.append(f"Standards: {json.dumps(stds[0])}")
+        return parts
+
+    juris_parts, code_parts = await asyncio.gather(
+        _jurisdiction_context(), _code_context())
+    return "\n".join(juris_parts + code_parts)
+
+
 @app.post("/chat/stream")
 async def chat_stream(req: ChatRequest):
     """SSE streaming endpoint for real-time chat UI.
     Structured intents use fast regex handlers. GENERAL/FEASIBILITY/REPORT
     stream from Claude Sonnet 4.5 with Supabase context injection.
     """
-    intent = classify_intent(req.query)
-    entities = extract_entities(req.query)
+    intent, entities = await classify_and_extract(req.query)
+
+    # Kick off the Claude branch's Supabase work before the generator is
+    # consumed, so it overlaps the SSE handshake and the opening frames
+    # instead of starting after "Consulting Claude..." is already on screen.
+    context_task = stats_task = None
+    if intent not in _STRUCTURED_INTENTS:
+        context_task = asyncio.create_task(_build_chat_context(entities))
+        if get_anthropic():
+            stats_task = asyncio.create_task(cached_stats())
 
     async def generate():
-        yield f"data: {json.dumps({'type': 'intent', 'value': intent})}\n\n"
-        yield f"data: {json.dumps({'type': 'entities', 'value': entities})}\n\n"
+        yield _sse({"type": "intent", "value": intent.name})
+        yield _sse({"type": "entities", "value": entities})
 
         # Structured intents: fast regex → Supabase
-        if intent in ("LIST_DISTRICTS", "DISTRICT_DETAIL",
-                       "ADDRESS_QUERY", "PARCEL_LOOKUP", "COUNTY_STATS"):
-            yield f"data: {json.dumps({'type': 'thinking', 'value': f'Querying {intent}...'})}\n\n"
-            handler = AGENT_MAP.get(intent, agent_general)
-            result = await handler(req.query, entities)
-            yield f"data: {json.dumps({'type': 'answer', 'value': result.get('answer', '')})}\n\n"
+        if intent in _STRUCTURED_INTENTS:
+            yield _sse({"type": "thinking", "value": f"Querying {intent.name}..."})
+            if intent is Intent.ADDRESS_QUERY:
+                # True incremental streaming: the address agent yields each
+                # markdown section as soon as its rows are unpacked, so the
+                # header is on screen while later categories are still being
+                # formatted. Other handlers still buffer, then are re-chunked.
+                first = True
+                result = {}
+                async for frame in agent_address_query_stream(req.query, entities):
+                    if frame["type"] == "result":
+                        result = frame["value"]
+                    else:
+                        delta = frame["value"] if first else "\n" + frame["value"]
+                        first = False
+                        yield _sse({"type": "answer_delta", "value": delta})
+            else:
+                handler = _AGENT_TABLE[intent]
+                result = await handler(req.query, entities)
+                # Emit the answer progressively — one markdown section per
+                # delta frame so the client paints early; each frame carries
+                # only its own bytes, not the whole rolling answer.
+                for i, section in enumerate(result.get("answer", "").split("\n\n")):
+                    delta = section if i == 0 else "\n\n" + section
+                    yield _sse({"type": "answer_delta", "value": delta})
             if result.get("data"):
-                yield f"data: {json.dumps({'type': 'data', 'value': result['data']}, default=str)}\n\n"
+                yield _sse({"type": "data", "value": result["data"]})
             for c in result.get("citations", []):
-                yield f"data: {json.dumps({'type': 'citation', 'value': c})}\n\n"
+                yield _sse({"type": "citation", "value": c})
             for s in result.get("suggestions", []):
-                yield f"data: {json.dumps({'type': 'suggestion', 'value': s})}\n\n"
+                yield _sse({"type": "suggestion", "value": s})
         else:
             # GENERAL/FEASIBILITY/REPORT: try Claude streaming
-            yield f"data: {json.dumps({'type': 'thinking', 'value': 'Consulting Claude...'})}\n\n"
-
-            # Gather context from Supabase
-            context_parts = []
-            if entities.get("jurisdiction"):
-                jname = entities["jurisdiction"]
-                jurs = await sb_query("jurisdictions",
-                    f"select=id,name,county&name=ilike.%25{sanitize_param(jname)}%25", limit=3)
-                if jurs:
-                    context_parts.append(f"Jurisdictions: {json.dumps(jurs)}")
-                    for j in jurs[:1]:
-                        dists = await sb_query("zoning_districts",
-                            f"select=code,name,category&jurisdiction_id=eq.{j['id']}", limit=20)
-                        if dists:
-                            context_parts.append(f"Districts in {j['name']}: {json.dumps(dists)}")
-
-            if entities.get("zoning_code"):
-                zcode = entities["zoning_code"]
-                dists = await sb_query("zoning_districts",
-                    f"select=id,code,name,description,category&code=ilike.{sanitize_param(zcode)}", limit=3)
-                if dists:
-                    context_parts.append(f"District data: {json.dumps(dists)}")
-                    for d in dists[:1]:
-                        stds = await sb_query("zone_standards",
-                            f"select=*&zoning_district_id=eq.{d['id']}", limit=1)
-                        if stds:
-                            context_parts.append(f"Standards: {json.dumps(stds)}")
+            yield _sse({"type": "thinking", "value": "Consulting Claude..."})
 
-            context = "\n".join(context_parts)
+            context = await context_task
 
             client = get_anthropic()
             if client:
                 try:
-                    stats_data = await get_stats()
+                    stats_data = await stats_task
                     system = CLAUDE_SYSTEM_PROMPT.format(stats=json.dumps(stats_data, default=str))
                     if context:
                         system += f"\n\nDatabase context:\n{context}"
 
-                    full_answer = ""
                     async with client.messages.stream(
                         model="claude-sonnet-4-5-20250929",
                         max_tokens=1024,
@@ -1038,22 +1560,25 @@ async def chat_stream(req: ChatRequest):
                         messages=[{"role": "user", "content": req.query}],
                         timeout=30.0,
                     ) as stream:
+                        # Deltas only: re-sending the accumulated answer made
+                        # each frame (and its serialization) grow with the
+                        # message — O(N²) bytes over a long response.
                         async for text in stream.text_stream:
-                            full_answer += text
-                            yield f"data: {json.dumps({'type': 'answer', 'value': full_answer})}\n\n"
-                            await asyncio.sleep(0.01)
+                            yield _sse({"type": "answer_delta", "value": text})
                 except Exception as e:
                     print(f"Claude streaming error: {type(e).__name__}: {e}")
-                    yield f"data: {json.dumps({'type': 'thinking', 'value': 'Falling back to structured query...'})}\n\n"
-                    # Fallback to regex handler
+                    yield _sse({"type": "thinking", "value": "Falling back to structured query..."})
+                    # Fallback to regex handler. Full "answer" frame (not a
+                    # delta): it must replace any partial Claude output the
+                    # client already concatenated before the error.
                     result = await agent_general(req.query, entities)
-                    yield f"data: {json.dumps({'type': 'answer', 'value': result.get('answer', '')})}\n\n"
+                    yield _sse({"type": "answer", "value": result.get("answer", "")})
             else:
                 # No API key — regex fallback
                 result = await agent_general(req.query, entities)
-                yield f"data: {json.dumps({'type': 'answer', 'value': result.get('answer', '')})}\n\n"
+                yield _sse({"type": "answer", "value": result.get("answer", "")})
 
-        yield f"data: {json.dumps({'type': 'done'})}\n\n"
+        yield _SSE_DONE
 
     return StreamingResponse(generate(), media_type="text/event-stream",
                              headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -1063,34 +1588,122 @@ async def chat_stream(req: ChatRequest):
 # REST ENDPOINTS — Direct data access for frontend map/tables
 # ═══════════════════════════════════════════════════════════════
 
+# ── Jurisdiction resolver cache ─────────────────────────────────
+# The jurisdictions table is small (~500 rows) and changes only when the
+# nightly scrapers run, so a primed name→row map answers exact resolves
+# in-process. Missing or partial names still fall back to ilike queries.
+
+_JURIS_BY_NAME: Dict[str, Dict] = {}
+_JURIS_BY_COUNTY: Dict[str, List[Dict]] = {}
+_JURIS_REFRESH_SECONDS = 600
+
+
+async def prime_jurisdiction_cache():
+    if not SUPABASE_KEY:
+        return
+    try:
+        rows = await sb_query("jurisdictions",
+            "select=id,name,county,data_completeness,municode_url", limit=2000)
+    except Exception:
+        return
+    if not rows:
+        return
+    by_name = {r["name"].casefold(): r for r in rows}
+    by_county = defaultdict(list)
+    for r in rows:
+        if r.get("county"):
+            by_county[r["county"].casefold()].append(r)
+    _JURIS_BY_NAME.clear()
+    _JURIS_BY_NAME.update(by_name)
+    _JURIS_BY_COUNTY.clear()
+    _JURIS_BY_COUNTY.update(by_county)
+
+
+def resolve_jurisdiction(name: str, county_fallback: bool = True) -> Optional[Dict]:
+    """Exact name (then county) hit from the primed cache, or None.
+
+    The county fallback picks the first municipality in the county — fine
+    for the address agent, which only needs somewhere plausible to anchor
+    an answer, but wrong for code lookups that would then pin the search
+    to an arbitrary city. Those callers pass county_fallback=False."""
+    key = name.casefold()
+    j = _JURIS_BY_NAME.get(key)
+    if j is None and county_fallback:
+        in_county = _JURIS_BY_COUNTY.get(key)
+        j = in_county[0] if in_county else None
+    return j
+
+
+async def _refresh_jurisdiction_cache():
+    while True:
+        await asyncio.sleep(_JURIS_REFRESH_SECONDS)
+        await prime_jurisdiction_cache()
+
+
+def _encode_cursor(row: Dict, fields: tuple) -> str:
+    """Opaque keyset cursor from the last row of a page."""
+    return base64.urlsafe_b64encode(
+        orjson.dumps({f: row.get(f) for f in fields})).decode()
+
+
+def _decode_cursor(cursor: str) -> Dict:
+    try:
+        return orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _etag_response(request: Request, payload, max_age: int = 60,
+                   etag_of=None) -> Response:
+    """Serve payload with an ETag; return 304 when the client already has it.
+    etag_of overrides what gets hashed (e.g. to ignore volatile timestamps)."""
+    body = orjson.dumps(etag_of if etag_of is not None else payload, default=str)
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(payload, headers=headers)
+
+
 @app.get("/api/jurisdictions")
 async def get_jurisdictions(
+    request: Request,
     county: Optional[str] = None,
     min_completeness: float = 0,
-    limit: int = 100
+    cursor: Optional[str] = None,
+    page_size: int = Query(100, ge=1, le=500),
 ):
-    """List jurisdictions with optional county filter."""
+    """List jurisdictions with optional county filter.
+    Keyset-paginated on (county, name): pass next_cursor back to continue."""
     params = f"select=id,name,county,data_completeness,data_source,municode_url&data_completeness=gte.{min_completeness}&order=county,name"
     if county:
-        params += f"&county=ilike.%25{county}%25"
-    return await sb_query("jurisdictions", params, limit=limit)
+        params += f"&county=ilike.%25{sanitize_param(county)}%25"
+    if cursor:
+        last = _decode_cursor(cursor)
+        lc = sanitize_param(str(last.get("county", "")))
+        ln = sanitize_param(str(last.get("name", "")))
+        params += f"&or=(county.gt.{lc},and(county.eq.{lc},name.gt.{ln}))"
+    rows = await sb_query("jurisdictions", params, limit=page_size + 1)
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_cursor(rows[-1], ("county", "name"))
+    return _etag_response(request, {"items": rows, "next_cursor": next_cursor})
 
 
 @app.get("/api/jurisdictions/{jid}/districts")
 async def get_jurisdiction_districts(jid: int):
     """Get all zoning districts for a jurisdiction."""
+    # PostgREST resource embedding: districts + their standards in one round trip
     districts = await sb_query("zoning_districts",
-        f"select=id,code,name,category&jurisdiction_id=eq.{jid}&order=category,code", limit=200)
+        f"select=id,code,name,category,zone_standards(min_lot_sqft,max_height_ft,front_setback_ft,side_setback_ft,rear_setback_ft)"
+        f"&jurisdiction_id=eq.{jid}&order=category,code", limit=200)
 
-    # Batch fetch standards
-    if districts:
-        dids = ",".join(str(d["id"]) for d in districts)
-        standards = await sb_query("zone_standards",
-            f"select=zoning_district_id,min_lot_sqft,max_height_ft,front_setback_ft,side_setback_ft,rear_setback_ft&zoning_district_id=in.({dids})",
-            limit=200)
-        std_map = {s["zoning_district_id"]: s for s in standards}
-        for d in districts:
-            d["standards"] = std_map.get(d["id"])
+    # Flatten the embedded list (one standards row per district) to match
+    # the existing response shape
+    for d in districts:
+        embedded = d.pop("zone_standards", None)
+        d["standards"] = embedded[0] if embedded else None
 
     return districts
 
@@ -1112,43 +1725,92 @@ async def get_district(did: int):
 @app.get("/api/parcels/{parcel_id}")
 async def get_parcel(parcel_id: str):
     """Look up parcel zone assignment."""
-    parcels = await sb_query("parcel_zones", f"select=*&parcel_id=eq.{parcel_id}", limit=1)
-    if not parcels:
+    parcel = await lookup_parcel(parcel_id)
+    if not parcel:
         raise HTTPException(404, "Parcel not found")
-    return parcels[0]
+    return parcel
 
 
-@app.get("/api/stats")
-async def get_stats():
-    """Platform-wide statistics."""
-    results = await asyncio.gather(
-        sb_count("jurisdictions"),
-        sb_count("zoning_districts"),
-        sb_count("zone_standards"),
-        sb_count("parcel_zones"),
-        sb_count("overlay_districts"),
-    )
+async def _stats_payload() -> Dict[str, Any]:
+    """Platform-wide counts, shared by /api/stats and the Claude prompt.
+
+    Preferred path: the stats_snapshot RPC
+    (migrations/20260901_stats_snapshot_rpc.sql) returns all five counts in
+    one statement. Fallback: the original five-way gather of header-only
+    counts, until the migration is applied.
+    """
+    try:
+        counts = await sb_rpc("stats_snapshot", ttl=60)
+    except Exception:
+        results = await asyncio.gather(
+            sb_count("jurisdictions"),
+            sb_count("zoning_districts"),
+            sb_count("zone_standards"),
+            sb_count("parcel_zones"),
+            sb_count("overlay_districts"),
+        )
+        counts = {
+            "jurisdictions": results[0],
+            "zoning_districts": results[1],
+            "zone_standards": results[2],
+            "parcel_zones": results[3],
+            "overlay_districts": results[4],
+        }
     return {
-        "jurisdictions": results[0],
-        "zoning_districts": results[1],
-        "zone_standards": results[2],
-        "parcel_zones": results[3],
-        "overlay_districts": results[4],
+        **counts,
         "counties": 67,
         "updated_at": datetime.utcnow().isoformat(),
     }
 
 
+_stats_cache = {"ts": 0.0, "value": None}
+
+
+async def cached_stats(ttl: float = 60) -> Dict[str, Any]:
+    """_stats_payload memoized for ttl seconds. The Claude paths only stuff
+    these numbers into the system prompt, so minute-old counts are fine and
+    each call saves five Supabase round trips."""
+    now = time.monotonic()
+    if _stats_cache["value"] is not None and now - _stats_cache["ts"] < ttl:
+        return _stats_cache["value"]
+    value = await _stats_payload()
+    _stats_cache["ts"] = now
+    _stats_cache["value"] = value
+    return value
+
+
+@app.get("/api/stats")
+async def get_stats(request: Request):
+    """Platform-wide statistics (60s in-process TTL, shared with /chat/stream)."""
+    payload = await cached_stats()
+    # Hash the counts only; updated_at changes per call and would defeat 304s.
+    return _etag_response(request, payload,
+                          etag_of={k: v for k, v in payload.items()
+                                   if k != "updated_at"})
+
+
 @app.get("/api/search")
 async def search_districts(
     q: str = Query(..., min_length=1, description="Search zoning codes or names"),
-    limit: int = 20
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=200),
 ):
-    """Full-text search across districts."""
-    results = await sb_query("zoning_districts",
-        f"select=id,code,name,category,jurisdiction_id&or=(code.ilike.%25{q}%25,name.ilike.%25{q}%25)&order=code",
-        limit=limit)
-    return results
+    """Full-text search across districts.
+    Keyset-paginated on (code, id): pass next_cursor back to continue."""
+    params = (f"select=id,code,name,category,jurisdiction_id"
+              f"&or=(code.ilike.%25{sanitize_param(q)}%25,name.ilike.%25{sanitize_param(q)}%25)"
+              f"&order=code,id")
+    if cursor:
+        last = _decode_cursor(cursor)
+        lc = sanitize_param(str(last.get("code", "")))
+        li = last.get("id", 0)
+        params += f"&or=(code.gt.{lc},and(code.eq.{lc},id.gt.{li}))"
+    rows = await sb_query("zoning_districts", params, limit=page_size + 1)
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_cursor(rows[-1], ("code", "id"))
+    return {"items": rows, "next_cursor": next_cursor}
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -1180,10 +1842,19 @@ SCHEDULED_WORKFLOWS = [
 ]
 
 
+# Workflow state changes on minute-plus timescales; 60s of staleness is
+# invisible on the dashboard and spares the GitHub rate-limit budget.
+_gh_cache: Dict[str, tuple] = {}
+_GH_CACHE_TTL = 60
+
+
 async def gh_workflow_runs(workflow: str) -> dict:
-    """Fetch last run status for a GitHub Actions workflow."""
+    """Fetch last run status for a GitHub Actions workflow (60s cache)."""
     if not GH_TOKEN:
         return {"status": "unknown", "last_run": None, "duration_seconds": None}
+    cached = _gh_cache.get(workflow)
+    if cached and time.monotonic() - cached[0] < _GH_CACHE_TTL:
+        return cached[1]
     client = await get_client()
     try:
         resp = await client.get(
@@ -1207,16 +1878,35 @@ async def gh_workflow_runs(workflow: str) -> dict:
             t1 = datetime.fromisoformat(created.replace("Z", "+00:00"))
             t2 = datetime.fromisoformat(updated.replace("Z", "+00:00"))
             duration = int((t2 - t1).total_seconds())
-        return {
+        result = {
             "status": conclusion,
             "last_run": updated,
             "duration_seconds": duration,
             "run_url": run.get("html_url")
         }
+        _gh_cache[workflow] = (time.monotonic(), result)
+        return result
     except Exception:
         return {"status": "error", "last_run": None, "duration_seconds": None}
 
 
+@app.post("/ops/cache/flush")
+async def flush_caches():
+    """Drop the in-process read caches and re-prime the jurisdiction map.
+
+    The sb_query/sb_count/sb_rpc TTL cache, the stats memo, and the primed
+    jurisdiction map all assume data changes on scraper cadence. The nightly
+    scraper workflow calls this after a run so fresh rows are visible
+    immediately instead of after the longest TTL (up to 10 minutes).
+    """
+    entries = len(_SB_CACHE)
+    _SB_CACHE.clear()
+    _stats_cache["ts"] = 0.0
+    _stats_cache["value"] = None
+    await prime_jurisdiction_cache()
+    return {"flushed": entries, "jurisdictions_primed": len(_JURIS_BY_NAME)}
+
+
 @app.get("/ops/metrics")
 async def ops_metrics():
     """
@@ -1225,20 +1915,30 @@ async def ops_metrics():
     """
     now = datetime.utcnow().isoformat() + "Z"
 
-    # ── Pipeline Health ──────────────────────────────────────────
-    county_total = await sb_count("jurisdictions")
-    counties_with_data = await sb_count("jurisdictions", "co_no=not.is.null")
-
-    # Recent scrape jobs (last 7 days)
-    scrape_jobs_recent = []
-    try:
-        scrape_jobs_recent = await sb_query(
+    async def _safe_rows(table: str, params: str, limit: int) -> List[Dict]:
+        try:
+            return await sb_query(table, params, limit=limit)
+        except Exception:
+            return []
+
+    # Every upstream read here is independent — five Supabase fetches plus
+    # one GitHub call per scheduled workflow — so they all share one gather
+    # and the endpoint waits for the slowest call, not the sum of all of them.
+    (county_total, counties_with_data, scrape_jobs_recent, pending_reports,
+     recent_errors, *run_datas) = await asyncio.gather(
+        sb_count("jurisdictions"),
+        sb_count("jurisdictions", "co_no=not.is.null"),
+        _safe_rows(
             "scrape_jobs",
             "select=id,county,status,started_at,completed_at,records_scraped,error_message&order=started_at.desc",
-            limit=100
-        )
-    except Exception:
-        pass
+            100),
+        _safe_rows("scrape_jobs", "select=id&status=eq.pending_report", 50),
+        _safe_rows(
+            "insights",
+            "select=id,county,error_message,created_at&type=eq.scrape_error&order=created_at.desc",
+            20),
+        *(gh_workflow_runs(wf["name"]) for wf in SCHEDULED_WORKFLOWS),
+    )
 
     total_jobs = len(scrape_jobs_recent)
     successful_jobs = sum(1 for j in scrape_jobs_recent if j.get("status") == "success")
@@ -1260,15 +1960,6 @@ async def ops_metrics():
 
     # ── Agent Status ─────────────────────────────────────────────
     running_jobs = [j for j in scrape_jobs_recent if j.get("status") == "running"]
-    pending_reports = []
-    try:
-        pending_reports = await sb_query(
-            "scrape_jobs",
-            "select=id&status=eq.pending_report",
-            limit=50
-        )
-    except Exception:
-        pass
 
     # ── Data Quality ─────────────────────────────────────────────
     records_today = 0
@@ -1279,30 +1970,15 @@ async def ops_metrics():
     except Exception:
         pass
 
-    # Recent errors from insights table
-    recent_errors = []
-    try:
-        recent_errors = await sb_query(
-            "insights",
-            "select=id,county,error_message,created_at&type=eq.scrape_error&order=created_at.desc",
-            limit=20
-        )
-    except Exception:
-        pass
-
     validation_errors = len(recent_errors)
     schema_compliance = round((1 - validation_errors / max(total_jobs, 1)) * 100, 1)
 
     # ── Scheduled Tasks ───────────────────────────────────────────
-    workflow_tasks = []
-    for wf in SCHEDULED_WORKFLOWS:
-        run_data = await gh_workflow_runs(wf["name"])
-        workflow_tasks.append({
-            "workflow": wf["name"],
-            "label": wf["label"],
-            "schedule": wf["schedule"],
-            **run_data
-        })
+    workflow_tasks = [
+        {"workflow": wf["name"], "label": wf["label"],
+         "schedule": wf["schedule"], **run_data}
+        for wf, run_data in zip(SCHEDULED_WORKFLOWS, run_datas)
+    ]
 
     return {
         "fetched_at": now,
@@ -0,0 +1,101 @@
+"""
+ZoneWise cache isolation tests — warm-cache regression
+
+The agents unpack Supabase payloads destructively (popping embedded
+zoning_districts / zone_standards), so the in-process cache must hand
+out isolated copies. Before the deepcopy fix, the second warm-cache hit
+saw the mutated payload and answered "0 zoning districts".
+
+These tests stub the HTTP client, so they run without a live database.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import main
+
+
+def _jurisdiction_payload():
+    return [{
+        "id": 1,
+        "name": "Satellite Beach",
+        "county": "Brevard",
+        "data_completeness": 100.0,
+        "municode_url": None,
+        "zoning_districts": [
+            {"id": 10, "code": "R-1", "name": "Single Family Residential",
+             "category": "Residential", "zone_standards": [{"count": 1}]},
+            {"id": 11, "code": "C-1", "name": "Neighborhood Commercial",
+             "category": "Commercial", "zone_standards": [{"count": 1}]},
+        ],
+    }]
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+class _FakeClient:
+    """Serves the same canned payload for every GET and counts requests."""
+
+    def __init__(self, content: bytes):
+        self._content = content
+        self.requests = 0
+
+    async def get(self, url, headers=None):
+        self.requests += 1
+        return _FakeResponse(self._content)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    main._SB_CACHE.clear()
+    yield
+    main._SB_CACHE.clear()
+
+
+def test_cache_get_returns_isolated_copies():
+    """Mutating one cache hit must not leak into the next."""
+    key = ("zoning_districts", "select=*", 10)
+    main._cache_put(key, [{"code": "R-1", "zone_standards": [{"count": 1}]}],
+                    ttl=300)
+    first = main._cache_get(key)
+    first[0].pop("zone_standards")
+    second = main._cache_get(key)
+    assert second[0]["zone_standards"] == [{"count": 1}]
+
+
+def test_cache_put_isolates_from_caller_mutation():
+    """Callers mutate the object they stored; the cache must not see it."""
+    key = ("jurisdictions", "select=*", 1)
+    value = [{"name": "Cocoa Beach", "zoning_districts": [{"code": "RM-1"}]}]
+    main._cache_put(key, value, ttl=300)
+    value[0].pop("zoning_districts")
+    assert main._cache_get(key)[0]["zoning_districts"] == [{"code": "RM-1"}]
+
+
+def test_list_districts_agent_twice_with_warm_cache(monkeypatch):
+    """Same agent, same query, second call served from cache — identical answer."""
+    fake = _FakeClient(main.orjson.dumps(_jurisdiction_payload()))
+
+    async def fake_get_client():
+        return fake
+
+    monkeypatch.setattr(main, "get_client", fake_get_client)
+    monkeypatch.setattr(main, "SUPABASE_KEY", "test-key")
+
+    entities = {"jurisdiction": "Satellite Beach"}
+    cold = asyncio.run(main.agent_list_districts(entities))
+    warm = asyncio.run(main.agent_list_districts(entities))
+
+    assert fake.requests == 1, "second call should be a cache hit"
+    assert "2 zoning districts" in cold["answer"]
+    assert warm["answer"] == cold["answer"]
+    assert "R-1" in warm["answer"] and "C-1" in warm["answer"]
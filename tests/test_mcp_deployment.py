@@ -12,13 +12,100 @@ Exit codes:
   3 = Partial failures (some tests passed)
 """
 
+import functools
+import importlib.util
 import os
+import re
 import sys
 import json
 import asyncio
-from pathlib import Path
+import threading
+from collections import defaultdict, deque
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # suite must stay runnable on a bare interpreter
+    orjson = None
+
+# Pre-resolved module attribute: skips the asyncio attribute chain per check
+_iscoro = asyncio.iscoroutinefunction
+
+# Environment is read-only for the lifetime of the run: snapshot the whole
+# mapping once at import, so lookups are plain dict gets and every suite sees
+# the same values even if something mutates os.environ mid-gather.
+_ENV_CACHE = dict(os.environ)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_prompt(path: str) -> str:
+    """Prompt files don't change mid-run; read each at most once."""
+    with open(path, encoding="utf-8") as fh:
+        return fh.read()
+
+
+# All seven required headings in one alternation: a single pass over each
+# prompt file instead of seven substring scans.
+_SECTION_RE = re.compile(
+    r"## (?:TASK|EXPECTED OUTCOME|CONTEXT|CONSTRAINTS|MUST DO|MUST NOT DO"
+    r"|OUTPUT FORMAT)"
+)
+
+
+# Expected deployment layout, hoisted so no suite rebuilds these per call.
+# Section order matters for the missing-sections report, so tuples (ordered)
+# rather than sets.
+_REQUIRED_FILES = (
+    "mcp/county_router_mcp.py",
+    "mcp/requirements.txt",
+    "mcp/README.md",
+    "app/prompts/template.md",
+    "app/prompts/scraper_agent.md",
+    "app/prompts/analysis_agent.md",
+    "app/prompts/report_agent.md",
+    "app/prompts/qa_agent.md",
+    "app/langgraph/nodes/mcp_integration.py",
+)
+
+_REQUIRED_SECTIONS = (
+    "## TASK",
+    "## EXPECTED OUTCOME",
+    "## CONTEXT",
+    "## CONSTRAINTS",
+    "## MUST DO",
+    "## MUST NOT DO",
+    "## OUTPUT FORMAT",
+)
+
+_PROMPT_FILES = (
+    "app/prompts/scraper_agent.md",
+    "app/prompts/analysis_agent.md",
+    "app/prompts/report_agent.md",
+    "app/prompts/qa_agent.md",
+)
+
+_REQ_ENV = (
+    ("DEEPSEEK_API_KEY", "DeepSeek API key"),
+    ("SUPABASE_URL", "Supabase URL"),
+    ("SUPABASE_SERVICE_ROLE_KEY", "Supabase service role key"),
+    ("AGENTQL_API_KEY", "AgentQL API key"),
+)
+
+
+def _ensure_path(package_dir: str):
+    """Put package_dir on sys.path exactly once (repeat inserts grew it)."""
+    p = os.path.abspath(package_dir)
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_router():
+    """Import and instantiate the MCP router once; three suites share it."""
+    _ensure_path("mcp")
+    from county_router_mcp import CountyRouterMCP
+    return CountyRouterMCP()
+
 
 class TestResult:
     """Track test execution results."""
@@ -28,24 +115,53 @@ class TestResult:
         self.tests_passed = 0
         self.tests_failed = 0
         self.tests_skipped = 0
-        self.failures = []
-    
+        self.failures = deque()
+        # Per-test output is buffered and flushed in one write at summary
+        # time: no per-line stdout flushes, and no interleaving between
+        # suites running concurrently under gather.
+        self._lines = deque()
+        self._merge_lock = threading.Lock()
+
+    def log(self, message: str):
+        self._lines.append(f"{message}\n")
+
     def record_pass(self, test_name: str):
         self.tests_run += 1
         self.tests_passed += 1
-        print(f"  ✅ {test_name}")
-    
+        self._lines.append(f"  ✅ {test_name}\n")
+
+    def record_pass_fmt(self, fmt: str, *args):
+        """record_pass with %-style deferred formatting: callers hand over
+        the pieces and the string is built once here, not eagerly in an
+        f-string at the call site."""
+        self.tests_run += 1
+        self.tests_passed += 1
+        self._lines.append("  ✅ " + (fmt % args) + "\n")
+
     def record_fail(self, test_name: str, error: str):
         self.tests_run += 1
         self.tests_failed += 1
         self.failures.append({"test": test_name, "error": error})
-        print(f"  ❌ {test_name}: {error}")
-    
+        self._lines.append(f"  ❌ {test_name}: {error}\n")
+
     def record_skip(self, test_name: str, reason: str):
         self.tests_skipped += 1
-        print(f"  ⏭️  {test_name}: {reason}")
-    
+        self._lines.append(f"  ⏭️  {test_name}: {reason}\n")
+
+    def merge(self, other: "TestResult"):
+        """Fold a per-suite recorder into this result in one locked step,
+        so suites running in worker threads can't interleave counter
+        updates or split each other's output blocks."""
+        with self._merge_lock:
+            self.tests_run += other.tests_run
+            self.tests_passed += other.tests_passed
+            self.tests_failed += other.tests_failed
+            self.tests_skipped += other.tests_skipped
+            self.failures.extend(other.failures)
+            self._lines.append("".join(other._lines))
+
     def summary(self):
+        sys.stdout.write("".join(self._lines))
         print("\n" + "="*60)
         print("TEST SUMMARY")
         print("="*60)
@@ -73,80 +189,82 @@ class TestResult:
             return 1
 
 
-async def test_file_structure(result: TestResult):
+def test_file_structure(result: TestResult):
     """Verify all deployed files exist."""
-    print("\n[1] File Structure Tests")
+    result.log("\n[1] File Structure Tests")
     
-    required_files = [
-        "mcp/county_router_mcp.py",
-        "mcp/requirements.txt",
-        "mcp/README.md",
-        "app/prompts/template.md",
-        "app/prompts/scraper_agent.md",
-        "app/prompts/analysis_agent.md",
-        "app/prompts/report_agent.md",
-        "app/prompts/qa_agent.md",
-        "app/langgraph/nodes/mcp_integration.py"
-    ]
-    
-    for filepath in required_files:
-        if Path(filepath).exists():
-            result.record_pass(f"File exists: {filepath}")
-        else:
-            result.record_fail(f"File missing: {filepath}", "File not found on filesystem")
+    # One scandir per parent directory instead of one stat per file:
+    # three directory reads cover all nine paths.
+    by_parent = defaultdict(list)
+    for filepath in _REQUIRED_FILES:
+        by_parent[os.path.dirname(filepath)].append(filepath)
+
+    for parent, paths in by_parent.items():
+        try:
+            entries = {e.name for e in os.scandir(parent)}
+        except OSError:
+            entries = set()
+        for filepath in paths:
+            if os.path.basename(filepath) in entries:
+                result.record_pass(f"File exists: {filepath}")
+            else:
+                result.record_fail(f"File missing: {filepath}", "File not found on filesystem")
 
 
 async def test_prompt_templates(result: TestResult):
     """Validate prompt template structure."""
-    print("\n[2] Prompt Template Tests")
-    
-    required_sections = [
-        "## TASK",
-        "## EXPECTED OUTCOME",
-        "## CONTEXT",
-        "## CONSTRAINTS",
-        "## MUST DO",
-        "## MUST NOT DO",
-        "## OUTPUT FORMAT"
-    ]
-    
-    prompt_files = [
-        "app/prompts/scraper_agent.md",
-        "app/prompts/analysis_agent.md",
-        "app/prompts/report_agent.md",
-        "app/prompts/qa_agent.md"
-    ]
-    
-    for prompt_file in prompt_files:
-        try:
-            content = Path(prompt_file).read_text()
-            
-            # Check all sections present
-            missing_sections = [s for s in required_sections if s not in content]
-            
-            if not missing_sections:
-                result.record_pass(f"7-section structure: {Path(prompt_file).name}")
-            else:
-                result.record_fail(
-                    f"7-section structure: {Path(prompt_file).name}",
-                    f"Missing sections: {missing_sections}"
-                )
-        except Exception as e:
-            result.record_fail(f"Template validation: {Path(prompt_file).name}", str(e))
+    # Read the four files in worker threads so the blocking I/O overlaps
+    # both itself and the other gathered suites; results land in the
+    # _read_prompt cache for any later consumer.
+    contents = await asyncio.gather(
+        *(asyncio.to_thread(_read_prompt, p) for p in _PROMPT_FILES),
+        return_exceptions=True,
+    )
 
+    # Header logged after the await so this suite's buffered block stays
+    # contiguous while other suites interleave at the suspension point.
+    result.log("\n[2] Prompt Template Tests")
+
+    for prompt_file, content in zip(_PROMPT_FILES, contents):
+        name = os.path.basename(prompt_file)
+        if isinstance(content, Exception):
+            result.record_fail(f"Template validation: {name}", str(content))
+            continue
+
+        # Check all sections present — one regex scan finds every heading
+        found = set(_SECTION_RE.findall(content))
+        missing_sections = [s for s in _REQUIRED_SECTIONS if s not in found]
+
+        if not missing_sections:
+            result.record_pass(f"7-section structure: {name}")
+        else:
+            result.record_fail(
+                f"7-section structure: {name}",
+                f"Missing sections: {missing_sections}"
+            )
 
-async def test_mcp_imports(result: TestResult):
+
+def test_mcp_imports(result: TestResult):
     """Verify MCP server can be imported."""
-    print("\n[3] Python Import Tests")
+    result.log("\n[3] Python Import Tests")
     
     try:
         # Add mcp directory to path
-        sys.path.insert(0, str(Path("mcp").absolute()))
-        
-        # Test imports
-        from county_router_mcp import CountyRouterMCP, FLORIDA_COUNTIES
-        
-        result.record_pass("Import CountyRouterMCP class")
+        _ensure_path("mcp")
+
+        # find_spec resolves the module without executing its body, so the
+        # structural check is free of import side effects
+        if importlib.util.find_spec("county_router_mcp") is None:
+            result.record_fail("MCP imports", "county_router_mcp not found on sys.path")
+            return
+
+        result.record_pass("Resolve county_router_mcp module")
+
+        # The county table requires the real import (module body runs once
+        # process-wide; _get_router reuses the loaded module)
+        from county_router_mcp import FLORIDA_COUNTIES
+
+        result.record_pass("Import CountyRouterMCP module")
         
         # Verify 67 counties
         if len(FLORIDA_COUNTIES) == 67:
@@ -158,31 +276,23 @@ async def test_mcp_imports(result: TestResult):
             )
         
         # Test router instantiation (without API key)
-        router = CountyRouterMCP()
+        router = _get_router()
         result.record_pass("Instantiate CountyRouterMCP (no API key)")
         
     except Exception as e:
         result.record_fail("MCP imports", str(e))
 
 
-async def test_environment_vars(result: TestResult):
+def test_environment_vars(result: TestResult):
     """Check environment variable configuration."""
-    print("\n[4] Environment Variable Tests")
+    result.log("\n[4] Environment Variable Tests")
     
-    # Required vars
-    required = {
-        "DEEPSEEK_API_KEY": "DeepSeek API key",
-        "SUPABASE_URL": "Supabase URL",
-        "SUPABASE_SERVICE_ROLE_KEY": "Supabase service role key",
-        "AGENTQL_API_KEY": "AgentQL API key"
-    }
-    
-    for var, description in required.items():
-        value = os.getenv(var)
+    for var, description in _REQ_ENV:
+        value = _ENV_CACHE.get(var)
         if value:
             # Mask sensitive values
             masked = f"{value[:8]}...{value[-4:]}" if len(value) > 12 else "***"
-            result.record_pass(f"{description}: {masked}")
+            result.record_pass_fmt("%s: %s", description, masked)
         else:
             if var == "DEEPSEEK_API_KEY":
                 # Expected to be missing initially
@@ -194,23 +304,13 @@ async def test_environment_vars(result: TestResult):
                 result.record_fail(f"{description}", "Environment variable not set")
 
 
-async def test_mcp_server_basic(result: TestResult):
+def test_mcp_server_basic(result: TestResult):
     """Test basic MCP server functionality (without API calls)."""
-    print("\n[5] MCP Server Basic Tests")
-    
-    if not os.getenv("DEEPSEEK_API_KEY"):
-        result.record_skip(
-            "MCP server functionality",
-            "DeepSeek API key required - skipping live tests"
-        )
-        return
-    
+    result.log("\n[5] MCP Server Basic Tests")
+
     try:
-        sys.path.insert(0, str(Path("mcp").absolute()))
-        from county_router_mcp import CountyRouterMCP
-        
-        router = CountyRouterMCP()
-        
+        router = _get_router()
+
         # Test prompt loading
         try:
             prompt = router.load_agent_prompt(
@@ -244,21 +344,11 @@ async def test_mcp_server_basic(result: TestResult):
 
 async def test_mcp_live_call(result: TestResult):
     """Test live MCP call to DeepSeek (requires API key)."""
-    print("\n[6] MCP Live Call Tests")
-    
-    if not os.getenv("DEEPSEEK_API_KEY"):
-        result.record_skip(
-            "Live MCP call",
-            "DeepSeek API key required - add key and re-run"
-        )
-        return
-    
+    result.log("\n[6] MCP Live Call Tests")
+
     try:
-        sys.path.insert(0, str(Path("mcp").absolute()))
-        from county_router_mcp import CountyRouterMCP
-        
-        router = CountyRouterMCP()
-        
+        router = _get_router()
+
         # Test scraper call (Brevard County)
         scrape_result = await router.scrape_county(
             county="Brevard",
@@ -273,8 +363,8 @@ async def test_mcp_live_call(result: TestResult):
         
         if scrape_result["success"]:
             result.record_pass("Live scraper call (Brevard)")
-            print(f"    → Cost: ${scrape_result.get('cost_usd', 0):.4f}")
-            print(f"    → Tokens: {scrape_result.get('tokens_used', 0)}")
+            result.log(f"    → Cost: ${scrape_result.get('cost_usd', 0):.4f}")
+            result.log(f"    → Tokens: {scrape_result.get('tokens_used', 0)}")
         else:
             result.record_fail(
                 "Live scraper call",
@@ -285,12 +375,12 @@ async def test_mcp_live_call(result: TestResult):
         result.record_fail("Live MCP call", str(e))
 
 
-async def test_langgraph_integration(result: TestResult):
+def test_langgraph_integration(result: TestResult):
     """Test LangGraph node integration."""
-    print("\n[7] LangGraph Integration Tests")
+    result.log("\n[7] LangGraph Integration Tests")
     
     try:
-        sys.path.insert(0, str(Path("app").absolute()))
+        _ensure_path("app")
         from langgraph.nodes.mcp_integration import (
             scraper_node_mcp,
             analysis_node_mcp,
@@ -299,17 +389,20 @@ async def test_langgraph_integration(result: TestResult):
         )
         
         result.record_pass("Import LangGraph MCP nodes")
-        
-        # Verify nodes are async functions
-        if asyncio.iscoroutinefunction(scraper_node_mcp):
-            result.record_pass("scraper_node_mcp is async")
-        else:
-            result.record_fail("scraper_node_mcp", "Not an async function")
-        
-        if asyncio.iscoroutinefunction(analysis_node_mcp):
-            result.record_pass("analysis_node_mcp is async")
-        else:
-            result.record_fail("analysis_node_mcp", "Not an async function")
+
+        # Verify every node is async in one pass — report_node_mcp and
+        # qa_node_mcp were imported but never actually checked before
+        nodes = (
+            ("scraper_node_mcp", scraper_node_mcp),
+            ("analysis_node_mcp", analysis_node_mcp),
+            ("report_node_mcp", report_node_mcp),
+            ("qa_node_mcp", qa_node_mcp),
+        )
+        for name, fn in nodes:
+            if _iscoro(fn):
+                result.record_pass(f"{name} is async")
+            else:
+                result.record_fail(name, "Not an async function")
     
     except Exception as e:
         result.record_fail("LangGraph integration", str(e))
@@ -317,39 +410,93 @@ async def test_langgraph_integration(result: TestResult):
 
 async def main():
     """Run all tests."""
+    started = datetime.now()  # one clock read serves the banner and the JSON
+
     print("="*60)
     print("ZONEWISE MCP DEPLOYMENT TEST SUITE")
     print("="*60)
-    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Working Directory: {Path.cwd()}")
+    print(f"Started: {started.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Working Directory: {os.getcwd()}")
     print()
     
     result = TestResult()
-    
-    # Run test suites
-    await test_file_structure(result)
-    await test_prompt_templates(result)
-    await test_mcp_imports(result)
-    await test_environment_vars(result)
-    await test_mcp_server_basic(result)
-    await test_mcp_live_call(result)
-    await test_langgraph_integration(result)
+
+    # Run test suites concurrently — they are independent, so the live
+    # DeepSeek call overlaps the filesystem and import work instead of
+    # serializing behind it. Only test_prompt_templates and
+    # test_mcp_live_call actually await; the rest are plain functions (no
+    # coroutine frames for sync code) pushed to worker threads so they
+    # still overlap the live call. record_* appends are single ops under
+    # the GIL, so counters stay consistent across threads. The
+    # DeepSeek-dependent suites are gated here, once, so without a key
+    # they are never scheduled.
+    def run_suite(fn):
+        local = TestResult()
+        fn(local)
+        result.merge(local)
+
+    async def run_async_suite(fn):
+        local = TestResult()
+        await fn(local)
+        result.merge(local)
+
+    sync_suites = [
+        test_file_structure,
+        test_mcp_imports,
+        test_environment_vars,
+        test_langgraph_integration,
+    ]
+    async_suites = [test_prompt_templates]
+    has_key = bool(_ENV_CACHE.get("DEEPSEEK_API_KEY"))
+    if has_key:
+        sync_suites.append(test_mcp_server_basic)
+    await asyncio.gather(
+        *(asyncio.to_thread(run_suite, fn) for fn in sync_suites),
+        *(run_async_suite(fn) for fn in async_suites),
+    )
+    # The live call runs last and only on an otherwise-green run: no point
+    # spending DeepSeek latency and per-call cost when the deployment is
+    # already known broken.
+    if has_key:
+        if result.tests_failed:
+            result.log("\n[6] MCP Live Call Tests")
+            result.record_skip("Live MCP call", "Skipped: earlier failures")
+        else:
+            await run_async_suite(test_mcp_live_call)
+    if not has_key:
+        result.log("\n[5] MCP Server Basic Tests")
+        result.record_skip(
+            "MCP server functionality",
+            "DeepSeek API key required - skipping live tests"
+        )
+        result.log("\n[6] MCP Live Call Tests")
+        result.record_skip(
+            "Live MCP call",
+            "DeepSeek API key required - add key and re-run"
+        )
     
     # Print summary
     exit_code = result.summary()
     
     # Save results to JSON
     results_json = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": started.isoformat(),
         "tests_run": result.tests_run,
         "tests_passed": result.tests_passed,
         "tests_failed": result.tests_failed,
         "tests_skipped": result.tests_skipped,
-        "failures": result.failures,
+        "failures": list(result.failures),
         "exit_code": exit_code
     }
     
-    Path("test_results.json").write_text(json.dumps(results_json, indent=2))
+    if orjson is not None:
+        with open("test_results.json", "wb") as fh:
+            fh.write(orjson.dumps(results_json, option=orjson.OPT_INDENT_2))
+    else:
+        # Stream straight into the buffered handle — no intermediate string
+        with open("test_results.json", "w", encoding="utf-8",
+                  buffering=65536) as fh:
+            json.dump(results_json, fh, indent=2)
     print(f"\nResults saved to: test_results.json")
     
     sys.exit(exit_code)